@@ -1,75 +1,92 @@
 """Quick setup script to initialize the API."""
 
-import os
+import contextlib
+import io
 import sys
 from pathlib import Path
+from typing import Callable, List
+
 
 def main():
-    """Run setup steps."""
-    print("=" * 60)
-    print("Docling Digitization API - Setup")
-    print("=" * 60)
-    print()
-    
+    """Run setup steps, writing all output in a single call at the end."""
+    lines: List[str] = []
+    try:
+        return run_setup(lines.append)
+    finally:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+
+def run_setup(say: Callable[[str], None]) -> int:
+    """Run setup steps, reporting progress through say()."""
+    say("=" * 60)
+    say("Docling Digitization API - Setup")
+    say("=" * 60)
+    say("")
+
     # Check if .env exists
     env_file = Path(".env")
     if not env_file.exists():
-        print("⚠️  .env file not found!")
-        print("   Creating from .env.example...")
-        
+        say("⚠️  .env file not found!")
+        say("   Creating from .env.example...")
+
         example_file = Path(".env.example")
         if example_file.exists():
             import shutil
             shutil.copy(example_file, env_file)
-            print("✅ .env file created")
-            print()
-            print("⚠️  IMPORTANT: Edit .env and add your credentials:")
-            print("   - DATABASE_URL (PostgreSQL/MySQL connection string)")
-            print("   - GEMINI_API_KEY (your Gemini API key)")
-            print()
+            say("✅ .env file created")
+            say("")
+            say("⚠️  IMPORTANT: Edit .env and add your credentials:")
+            say("   - DATABASE_URL (PostgreSQL/MySQL connection string)")
+            say("   - GEMINI_API_KEY (your Gemini API key)")
+            say("")
         else:
-            print("❌ .env.example not found!")
+            say("❌ .env.example not found!")
             return 1
     else:
-        print("✅ .env file found")
-        print()
-    
+        say("✅ .env file found")
+        say("")
+
     # Install dependencies
-    print("Installing API dependencies...")
-    print("Run: pip install -r requirements-api.txt")
-    print()
-    
-    # Initialize database
-    print("Initializing database...")
+    say("Installing API dependencies...")
+    say("Run: pip install -r requirements-api.txt")
+    say("")
+
+    # Initialize database (skipped if all tables already exist)
+    say("Initializing database...")
     try:
         from src.database import init_db
-        init_db()
-        print("✅ Database initialized successfully")
-        print()
+        with contextlib.redirect_stdout(io.StringIO()):
+            created = init_db()
+        if created:
+            say(f"✅ Database initialized successfully ({', '.join(created)})")
+        else:
+            say("✅ Database already initialized")
+        say("")
     except Exception as e:
-        print(f"❌ Database initialization failed: {e}")
-        print("   Make sure DATABASE_URL in .env is correct")
-        print()
+        say(f"❌ Database initialization failed: {e}")
+        say("   Make sure DATABASE_URL in .env is correct")
+        say("")
         return 1
-    
+
     # Create directories
-    print("Creating directories...")
+    say("Creating directories...")
     dirs = ["uploads", "output", "output/images", "output/tables"]
     for dir_name in dirs:
         Path(dir_name).mkdir(parents=True, exist_ok=True)
-    print("✅ Directories created")
-    print()
-    
-    print("=" * 60)
-    print("Setup Complete!")
-    print("=" * 60)
-    print()
-    print("Next steps:")
-    print("1. Edit .env and add your credentials")
-    print("2. Run the API: python src/api/main.py")
-    print("3. Open http://localhost:8000/docs for API documentation")
-    print()
-    
+    say("✅ Directories created")
+    say("")
+
+    say("=" * 60)
+    say("Setup Complete!")
+    say("=" * 60)
+    say("")
+    say("Next steps:")
+    say("1. Edit .env and add your credentials")
+    say("2. Run the API: python src/api/main.py")
+    say("3. Open http://localhost:8000/docs for API documentation")
+    say("")
+
     return 0
 
 if __name__ == "__main__":
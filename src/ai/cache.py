@@ -0,0 +1,108 @@
+"""Content-addressed cache for Gemini responses."""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Two-level cache mapping a request hash to the generated text.
+
+    Lookups hit a bounded in-process dict first and then an optional
+    SQLite file, so identical tables/images/documents are only sent to
+    Gemini once, even across reruns of the pipeline.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_memory_items: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite file for the persistent layer (None or "" disables it)
+            max_memory_items: Maximum number of entries kept in memory
+        """
+        self._memory: Dict[str, str] = {}
+        self._max_memory_items = max_memory_items
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if path:
+            try:
+                self._conn = sqlite3.connect(path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Gemini response cache disabled ({path}): {e}")
+                self._conn = None
+
+    @staticmethod
+    def make_key(model: str, messages: Iterable[Any], schema: Optional[str] = None) -> str:
+        """
+        Build a SHA-256 cache key from the model name, response schema and request messages.
+
+        Args:
+            model: Model name the request is sent to
+            messages: LangChain messages (anything with .type and .content)
+            schema: Name of the structured-output schema the response is
+                constrained to (None for free text), so free-text and JSON
+                answers to the same prompt are cached separately
+
+        Returns:
+            Hex digest identifying the request
+        """
+        digest = hashlib.sha256(model.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update((schema or "").encode("utf-8"))
+        for message in messages:
+            content = message.content
+            if not isinstance(content, str):
+                content = json.dumps(content, sort_keys=True)
+            digest.update(b"\0")
+            digest.update(message.type.encode("utf-8"))
+            digest.update(b"\0")
+            digest.update(content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None."""
+        value = self._memory.get(key)
+        if value is not None or self._conn is None:
+            return value
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        self._remember(key, row[0])
+        return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """Store value under key in both cache levels."""
+        self._remember(key, value)
+        if self._conn is None:
+            return
+
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)", (key, value)
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to persist Gemini response: {e}")
+
+    def _remember(self, key: str, value: str) -> None:
+        """Add an entry to the in-memory layer, evicting the oldest if full."""
+        if len(self._memory) >= self._max_memory_items:
+            self._memory.pop(next(iter(self._memory)))
+        self._memory[key] = value
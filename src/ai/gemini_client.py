@@ -1,19 +1,173 @@
 """Gemini AI client using LangChain for content summarization."""
 
+import asyncio
+import hashlib
+import importlib
+import json
 import os
-from typing import Optional
+from functools import lru_cache
+from typing import AsyncIterator, Iterator, List, Optional, Sequence, Tuple
 from pathlib import Path
 import logging
-from dotenv import load_dotenv
 
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage, SystemMessage
-
-# Load environment variables
-load_dotenv()
+from src.config import get_env
+from .cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
+# Model used when GEMINI_MODEL is not set
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+# JSON schema for table/document summaries (decoded server-side, so no
+# free-text cleanup or retries are needed)
+SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {"summary": {"type": "string"}},
+    "required": ["summary"],
+}
+
+# JSON schema for batched image descriptions, one entry per image in order
+IMAGE_BATCH_SCHEMA = {
+    "type": "object",
+    "properties": {"descriptions": {"type": "array", "items": {"type": "string"}}},
+    "required": ["descriptions"],
+}
+
+# Response schemas selectable through _get_llm(schema=...)
+_SCHEMAS = {"summary": SUMMARY_SCHEMA, "image_batch": IMAGE_BATCH_SCHEMA}
+
+# Images described per vision request by describe_images_batch_async()
+IMAGE_BATCH_SIZE = 8
+
+# Longest image side sent to the vision model; larger images are downscaled
+MAX_IMAGE_DIMENSION = 1568
+
+# Image files the vision model accepts directly, and the largest one sent
+# without re-encoding
+PASSTHROUGH_MIME_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+}
+PASSTHROUGH_MAX_BYTES = 4 * 1024 * 1024
+
+# Input budgets (in model tokens) for table CSV data and document text
+TABLE_MAX_TOKENS = 4000
+DOCUMENT_MAX_TOKENS = 12000
+
+# Upper bound on characters per token, used to skip token counting for
+# inputs that cannot exceed a budget and to pre-trim very long ones
+MAX_CHARS_PER_TOKEN = 8
+
+# Prompt templates, filled with str.format_map() per request
+TABLE_SYSTEM_PROMPT = "You are a data analyst expert at summarizing tabular data."
+TABLE_PROMPT_TMPL = """Analyze the following table data and provide a concise summary (2-3 sentences) 
+highlighting the key information, trends, or insights.
+
+{caption_line}
+
+Table Data (CSV format):
+{csv_data}
+
+Provide a clear, concise summary:"""
+
+IMAGE_PROMPT_TMPL = """Describe this image in 2-3 sentences. Focus on the main content, 
+any text visible, charts/graphs, or key visual elements.
+
+{caption_line}
+
+Provide a clear description:"""
+
+IMAGE_BATCH_PROMPT_TMPL = """Describe each of the following {count} images in 2-3 sentences. 
+Focus on the main content, any text visible, charts/graphs, or key visual elements.
+Return exactly one description per image, in the order the images are given."""
+
+DOCUMENT_SYSTEM_PROMPT = "You are an expert at summarizing documents concisely and accurately."
+DOCUMENT_PROMPT_TMPL = """Provide a comprehensive summary of the following document text 
+in approximately {max_length} words. Focus on the main topics, key points, and conclusions.
+
+Document Text:
+{text}
+
+Summary:"""
+
+# LangChain is imported lazily (on first use) so that importing this
+# module, e.g. during API startup without a Gemini key, stays cheap.
+_LAZY_IMPORTS = {
+    "ChatGoogleGenerativeAI": "langchain_google_genai",
+    "HumanMessage": "langchain_core.messages",
+    "SystemMessage": "langchain_core.messages",
+}
+
+
+def __getattr__(name: str):
+    """Resolve LangChain names previously imported at module level."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
+
+
+@lru_cache(maxsize=8)
+def _get_llm(model: str, api_key: str, schema: Optional[str] = None):
+    """
+    Get the process-wide LangChain chat model for a model name.
+    
+    Chat models hold the underlying Google API clients (and their HTTP/gRPC
+    connection pools), so sharing one instance per model lets every
+    GeminiClient reuse the same connections for sync and async calls.
+    
+    Args:
+        model: Gemini model name
+        api_key: Gemini API key
+        schema: Constrain output to JSON matching a _SCHEMAS entry ("summary"
+            or "image_batch"); None for free text
+    """
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    
+    options = {}
+    if schema:
+        options = {
+            "response_mime_type": "application/json",
+            "response_schema": _SCHEMAS[schema],
+        }
+    
+    return ChatGoogleGenerativeAI(
+        model=model,
+        google_api_key=api_key,
+        temperature=0.3,  # Lower temperature for more focused summaries
+        **options
+    )
+
+
+@lru_cache(maxsize=None)
+def _system_message(content: str):
+    """Get a shared SystemMessage for a fixed system prompt (messages are never mutated)."""
+    from langchain_core.messages import SystemMessage
+    
+    return SystemMessage(content=content)
+
+
+def _parse_summary(text: str) -> str:
+    """Extract the summary from a structured response, falling back to raw text."""
+    try:
+        summary = json.loads(text)["summary"]
+    except (ValueError, TypeError, KeyError):
+        return text
+    return summary.strip() if isinstance(summary, str) else text
+
+
+def _parse_descriptions(text: str, count: int) -> Optional[List[str]]:
+    """Extract count image descriptions from a batched response, or None if malformed."""
+    try:
+        descriptions = json.loads(text)["descriptions"]
+    except (ValueError, TypeError, KeyError):
+        return None
+    if not isinstance(descriptions, list) or len(descriptions) != count:
+        return None
+    return [str(description).strip() for description in descriptions]
+
 
 class GeminiClient:
     """Client for Gemini API interactions using LangChain."""
@@ -25,7 +179,16 @@ class GeminiClient:
         Args:
             api_key: Gemini API key (defaults to GEMINI_API_KEY env var)
         """
-        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        self.api_key = api_key or get_env("GEMINI_API_KEY")
+        
+        # Upper bound on in-flight requests for the *_async methods
+        self._semaphore = asyncio.Semaphore(int(get_env("GEMINI_CONCURRENCY", "10")))
+        
+        # Identical requests are answered from cache instead of the API
+        self.cache = ResponseCache(get_env("GEMINI_CACHE_PATH", ".gemini_cache.sqlite"))
+        
+        # Token counts by (model, text digest), so re-truncating is free
+        self._token_counts: dict = {}
         
         if not self.api_key:
             logger.warning("Gemini API key not found. AI summarization will be disabled.")
@@ -33,21 +196,16 @@ class GeminiClient:
             return
         
         try:
-            # Initialize LangChain Gemini model
-            self.llm = ChatGoogleGenerativeAI(
-                model="gemini-pro",
-                google_api_key=self.api_key,
-                temperature=0.3,  # Lower temperature for more focused summaries
-                convert_system_message_to_human=True
-            )
+            # Initialize LangChain Gemini model. 2.5-series models handle
+            # images natively, so text and vision share one model unless
+            # GEMINI_VISION_MODEL selects a different one.
+            model = get_env("GEMINI_MODEL", DEFAULT_MODEL)
+            vision_model = get_env("GEMINI_VISION_MODEL", model)
             
-            # For vision tasks (images)
-            self.vision_llm = ChatGoogleGenerativeAI(
-                model="gemini-pro-vision",
-                google_api_key=self.api_key,
-                temperature=0.3,
-                convert_system_message_to_human=True
-            )
+            self.llm = _get_llm(model, self.api_key)
+            self.summary_llm = _get_llm(model, self.api_key, schema="summary")
+            self.vision_llm = self.llm if vision_model == model else _get_llm(vision_model, self.api_key)
+            self.image_batch_llm = _get_llm(vision_model, self.api_key, schema="image_batch")
             
             self.enabled = True
             logger.info("Gemini AI client initialized successfully with LangChain")
@@ -55,6 +213,212 @@ class GeminiClient:
             logger.error(f"Failed to initialize Gemini client: {e}")
             self.enabled = False
     
+    def _cache_key(self, llm, messages: list) -> str:
+        """Build the response cache key for a request to one of the client's models."""
+        if llm is self.summary_llm:
+            schema = "summary"
+        elif llm is self.image_batch_llm:
+            schema = "image_batch"
+        else:
+            schema = None
+        return ResponseCache.make_key(llm.model, messages, schema)
+    
+    def _complete(self, llm, messages: list) -> str:
+        """Invoke llm with messages, answering repeated requests from cache."""
+        key = self._cache_key(llm, messages)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        text = self._response_text(llm, llm.invoke(messages))
+        self.cache.put(key, text)
+        return text
+    
+    async def _acomplete(self, llm, messages: list) -> str:
+        """Async variant of _complete(), limited by the client semaphore."""
+        key = self._cache_key(llm, messages)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        async with self._semaphore:
+            response = await llm.ainvoke(messages)
+        text = self._response_text(llm, response)
+        self.cache.put(key, text)
+        return text
+    
+    def _response_text(self, llm, response) -> str:
+        """Get the generated text, unwrapping structured summary responses."""
+        text = response.content.strip()
+        if llm is self.summary_llm:
+            text = _parse_summary(text)
+        return text
+    
+    def _count_tokens(self, llm, text: str) -> int:
+        """
+        Count the tokens llm sees for text, caching counts by text digest.
+        
+        Counting calls the Gemini count_tokens endpoint (blocking network
+        I/O), so async callers must run this in a worker thread.
+        """
+        key = (llm.model, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest())
+        count = self._token_counts.get(key)
+        if count is None:
+            try:
+                count = llm.get_num_tokens(text)
+            except Exception as e:
+                # Rough estimate if the token counting endpoint is unavailable
+                logger.debug(f"Token counting failed, estimating: {e}")
+                count = len(text) // 4
+            if len(self._token_counts) >= 1024:
+                self._token_counts.clear()
+            self._token_counts[key] = count
+        return count
+    
+    def _truncate_to_tokens(self, llm, text: str, max_tokens: int) -> tuple:
+        """
+        Truncate text to at most max_tokens model tokens.
+        
+        Texts shorter than max_tokens characters are returned without counting
+        (a token is at least one character). Otherwise the text is cut in
+        proportion to its measured token count until it fits the budget.
+        
+        Returns:
+            Tuple of (text, truncated)
+        """
+        if len(text) <= max_tokens:
+            return text, False
+        
+        truncated = len(text) > max_tokens * MAX_CHARS_PER_TOKEN
+        if truncated:
+            text = text[:max_tokens * MAX_CHARS_PER_TOKEN]
+        
+        for _ in range(5):
+            count = self._count_tokens(llm, text)
+            if count <= max_tokens:
+                break
+            # Aim slightly under the budget so one cut usually suffices
+            text = text[:int(len(text) * max_tokens / count * 0.95)]
+            truncated = True
+        
+        return text, truncated
+    
+    def _table_messages(self, csv_data: str, caption: Optional[str]) -> list:
+        """Build the LangChain messages for a table summary request."""
+        from langchain_core.messages import HumanMessage
+
+        # Truncate CSV if over the token budget
+        csv_data, truncated = self._truncate_to_tokens(self.summary_llm, csv_data, TABLE_MAX_TOKENS)
+        if truncated:
+            csv_data += "\n... (truncated)"
+        
+        user_msg = TABLE_PROMPT_TMPL.format_map({
+            "caption_line": f"Table Caption: {caption}" if caption else "",
+            "csv_data": csv_data,
+        })
+        
+        return [
+            _system_message(TABLE_SYSTEM_PROMPT),
+            HumanMessage(content=user_msg)
+        ]
+    
+    @staticmethod
+    def _encode_image(image_path: str) -> tuple:
+        """
+        Base64-encode an image for the vision model.
+        
+        Small PNG/JPEG/WebP files that are already within the size budget are
+        sent as-is; everything else is decoded, downscaled and re-encoded as JPEG.
+        
+        Returns:
+            Tuple of (mime_type, base64_data)
+        """
+        from PIL import Image
+        import base64
+        from io import BytesIO
+        
+        # Opening only parses the header, so the size check is cheap
+        image = Image.open(image_path)
+        fits = max(image.size) <= MAX_IMAGE_DIMENSION
+        
+        mime_type = PASSTHROUGH_MIME_TYPES.get(Path(image_path).suffix.lower())
+        if mime_type and fits and os.path.getsize(image_path) <= PASSTHROUGH_MAX_BYTES:
+            image.close()
+            return mime_type, base64.b64encode(Path(image_path).read_bytes()).decode()
+        
+        # Downscale anything larger than the vision input budget
+        if not fits:
+            image.thumbnail((MAX_IMAGE_DIMENSION, MAX_IMAGE_DIMENSION), Image.LANCZOS)
+        
+        # JPEG has no alpha/palette support
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        
+        # JPEG is far smaller than PNG for photos and scans
+        buffered = BytesIO()
+        image.save(buffered, format="JPEG", quality=85, optimize=True)
+        return "image/jpeg", base64.b64encode(buffered.getvalue()).decode()
+    
+    def _image_messages(self, image_path: str, caption: Optional[str]) -> list:
+        """Load and encode an image and build the vision request messages."""
+        from langchain_core.messages import HumanMessage
+        
+        mime_type, img_base64 = self._encode_image(image_path)
+        
+        prompt = IMAGE_PROMPT_TMPL.format_map({
+            "caption_line": f"Image Caption: {caption}" if caption else "",
+        })
+        
+        # Note: LangChain's vision support may vary
+        # For now, we'll use a text-based approach
+        # In production, you might want to use the Vision API directly
+        
+        return [
+            HumanMessage(
+                content=[
+                    {"type": "text", "text": prompt},
+                    {
+                        "type": "image_url",
+                        "image_url": f"data:{mime_type};base64,{img_base64}"
+                    }
+                ]
+            )
+        ]
+    
+    def _image_batch_messages(self, items: Sequence[Tuple[str, Optional[str]]]) -> list:
+        """Load and encode several images and build one vision request for all of them."""
+        from langchain_core.messages import HumanMessage
+        
+        content = [{"type": "text", "text": IMAGE_BATCH_PROMPT_TMPL.format_map({"count": len(items)})}]
+        for number, (image_path, caption) in enumerate(items, 1):
+            mime_type, img_base64 = self._encode_image(image_path)
+            label = f"Image {number}"
+            if caption:
+                label += f" (Image Caption: {caption})"
+            content.append({"type": "text", "text": label})
+            content.append({
+                "type": "image_url",
+                "image_url": f"data:{mime_type};base64,{img_base64}"
+            })
+        
+        return [HumanMessage(content=content)]
+    
+    def _document_messages(self, text: str, max_length: int) -> list:
+        """Build the LangChain messages for a document summary request."""
+        from langchain_core.messages import HumanMessage
+
+        # Truncate text if over the token budget
+        text, truncated = self._truncate_to_tokens(self.summary_llm, text, DOCUMENT_MAX_TOKENS)
+        if truncated:
+            text += "..."
+        
+        user_msg = DOCUMENT_PROMPT_TMPL.format_map({"max_length": max_length, "text": text})
+        
+        return [
+            _system_message(DOCUMENT_SYSTEM_PROMPT),
+            HumanMessage(content=user_msg)
+        ]
+    
     def summarize_table(self, csv_data: str, caption: Optional[str] = None) -> Optional[str]:
         """
         Generate a summary of table data using LangChain.
@@ -70,28 +434,30 @@ class GeminiClient:
             return None
         
         try:
-            # Truncate CSV if too long
-            if len(csv_data) > 10000:
-                csv_data = csv_data[:10000] + "\n... (truncated)"
-            
-            system_msg = "You are a data analyst expert at summarizing tabular data."
-            user_msg = f"""Analyze the following table data and provide a concise summary (2-3 sentences) 
-highlighting the key information, trends, or insights.
-
-{f'Table Caption: {caption}' if caption else ''}
-
-Table Data (CSV format):
-{csv_data}
-
-Provide a clear, concise summary:"""
-            
-            messages = [
-                SystemMessage(content=system_msg),
-                HumanMessage(content=user_msg)
-            ]
+            summary = self._complete(self.summary_llm, self._table_messages(csv_data, caption))
+            logger.info(f"Generated table summary: {summary[:100]}...")
+            return summary
             
-            response = self.llm.invoke(messages)
-            summary = response.content.strip()
+        except Exception as e:
+            logger.error(f"Failed to generate table summary: {e}")
+            return None
+    
+    async def summarize_table_async(self, csv_data: str, caption: Optional[str] = None) -> Optional[str]:
+        """
+        Async variant of summarize_table().
+        
+        Concurrent calls are limited by the client's semaphore
+        (GEMINI_CONCURRENCY), so many tables can be summarized with
+        asyncio.gather() without flooding the API. Building the request
+        (which may count tokens over the network) runs in a worker thread.
+        """
+        if not self.enabled:
+            return None
+        
+        try:
+            # Truncation may count tokens over the network; keep it off the event loop
+            messages = await asyncio.to_thread(self._table_messages, csv_data, caption)
+            summary = await self._acomplete(self.summary_llm, messages)
             logger.info(f"Generated table summary: {summary[:100]}...")
             return summary
             
@@ -114,43 +480,28 @@ Provide a clear, concise summary:"""
             return None
         
         try:
-            from PIL import Image
-            import base64
-            from io import BytesIO
-            
-            # Load and encode image
-            image = Image.open(image_path)
-            
-            # Convert to base64
-            buffered = BytesIO()
-            image.save(buffered, format="PNG")
-            img_base64 = base64.b64encode(buffered.getvalue()).decode()
-            
-            prompt = f"""Describe this image in 2-3 sentences. Focus on the main content, 
-any text visible, charts/graphs, or key visual elements.
-
-{f'Image Caption: {caption}' if caption else ''}
-
-Provide a clear description:"""
-            
-            # Note: LangChain's vision support may vary
-            # For now, we'll use a text-based approach
-            # In production, you might want to use the Vision API directly
-            
-            messages = [
-                HumanMessage(
-                    content=[
-                        {"type": "text", "text": prompt},
-                        {
-                            "type": "image_url",
-                            "image_url": f"data:image/png;base64,{img_base64}"
-                        }
-                    ]
-                )
-            ]
+            description = self._complete(self.vision_llm, self._image_messages(image_path, caption))
+            logger.info(f"Generated image description: {description[:100]}...")
+            return description
             
-            response = self.vision_llm.invoke(messages)
-            description = response.content.strip()
+        except Exception as e:
+            logger.error(f"Failed to generate image description: {e}")
+            # Fallback: return basic info
+            return f"Image file: {Path(image_path).name}"
+    
+    async def describe_image_async(self, image_path: str, caption: Optional[str] = None) -> Optional[str]:
+        """
+        Async variant of describe_image().
+        
+        Image decoding and encoding run in a worker thread so they do not
+        block the event loop.
+        """
+        if not self.enabled:
+            return None
+        
+        try:
+            messages = await asyncio.to_thread(self._image_messages, image_path, caption)
+            description = await self._acomplete(self.vision_llm, messages)
             logger.info(f"Generated image description: {description[:100]}...")
             return description
             
@@ -159,6 +510,43 @@ Provide a clear description:"""
             # Fallback: return basic info
             return f"Image file: {Path(image_path).name}"
     
+    async def describe_images_batch_async(
+        self,
+        items: Sequence[Tuple[str, Optional[str]]]
+    ) -> List[Optional[str]]:
+        """
+        Describe several images with a single vision request.
+        
+        Sending up to IMAGE_BATCH_SIZE images per request amortizes request
+        overhead and prompt processing. If the batched response can't be
+        matched up with the images, each image is described individually.
+        
+        Args:
+            items: (image_path, caption) pairs
+            
+        Returns:
+            One description (or None) per item, in order
+        """
+        if not self.enabled:
+            return [None] * len(items)
+        if len(items) == 1:
+            return [await self.describe_image_async(*items[0])]
+        
+        try:
+            messages = await asyncio.to_thread(self._image_batch_messages, items)
+            text = await self._acomplete(self.image_batch_llm, messages)
+            descriptions = _parse_descriptions(text, len(items))
+            if descriptions is not None:
+                logger.info(f"Generated {len(descriptions)} image descriptions in one request")
+                return descriptions
+            logger.warning("Batched image response did not match the images; describing individually")
+        except Exception as e:
+            logger.error(f"Failed to generate batched image descriptions: {e}")
+        
+        return list(await asyncio.gather(
+            *(self.describe_image_async(image_path, caption) for image_path, caption in items)
+        ))
+    
     def summarize_document(self, text: str, max_length: int = 500) -> Optional[str]:
         """
         Generate a summary of document text using LangChain.
@@ -174,26 +562,22 @@ Provide a clear description:"""
             return None
         
         try:
-            # Truncate text if too long
-            if len(text) > 30000:
-                text = text[:30000] + "..."
-            
-            system_msg = "You are an expert at summarizing documents concisely and accurately."
-            user_msg = f"""Provide a comprehensive summary of the following document text 
-in approximately {max_length} words. Focus on the main topics, key points, and conclusions.
-
-Document Text:
-{text}
-
-Summary:"""
-            
-            messages = [
-                SystemMessage(content=system_msg),
-                HumanMessage(content=user_msg)
-            ]
+            summary = self._complete(self.summary_llm, self._document_messages(text, max_length))
+            logger.info(f"Generated document summary: {summary[:100]}...")
+            return summary
             
-            response = self.llm.invoke(messages)
-            summary = response.content.strip()
+        except Exception as e:
+            logger.error(f"Failed to generate document summary: {e}")
+            return None
+    
+    async def summarize_document_async(self, text: str, max_length: int = 500) -> Optional[str]:
+        """Async variant of summarize_document()."""
+        if not self.enabled:
+            return None
+        
+        try:
+            messages = await asyncio.to_thread(self._document_messages, text, max_length)
+            summary = await self._acomplete(self.summary_llm, messages)
             logger.info(f"Generated document summary: {summary[:100]}...")
             return summary
             
@@ -201,6 +585,71 @@ Summary:"""
             logger.error(f"Failed to generate document summary: {e}")
             return None
 
+    
+    def summarize_document_stream(self, text: str, max_length: int = 500) -> Iterator[str]:
+        """
+        Stream a document summary as it is generated.
+        
+        Yields text chunks as soon as Gemini produces them, so callers (e.g.
+        a FastAPI StreamingResponse) can start forwarding the summary before
+        generation finishes. The complete text is cached like the other
+        summaries; a cached summary is yielded as a single chunk.
+        
+        Args:
+            text: Document text to summarize
+            max_length: Maximum length of summary in words
+            
+        Yields:
+            Summary text chunks (nothing if disabled or failed)
+        """
+        if not self.enabled:
+            return
+        
+        # Stream plain text; JSON-structured output cannot be forwarded incrementally
+        messages = self._document_messages(text, max_length)
+        key = self._cache_key(self.llm, messages)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        chunks = []
+        try:
+            for chunk in self.llm.stream(messages):
+                if chunk.content:
+                    chunks.append(chunk.content)
+                    yield chunk.content
+        except Exception as e:
+            logger.error(f"Failed to stream document summary: {e}")
+            return
+        
+        self.cache.put(key, "".join(chunks).strip())
+    
+    async def summarize_document_astream(self, text: str, max_length: int = 500) -> AsyncIterator[str]:
+        """Async variant of summarize_document_stream()."""
+        if not self.enabled:
+            return
+        
+        messages = await asyncio.to_thread(self._document_messages, text, max_length)
+        key = self._cache_key(self.llm, messages)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        chunks = []
+        try:
+            async with self._semaphore:
+                async for chunk in self.llm.astream(messages):
+                    if chunk.content:
+                        chunks.append(chunk.content)
+                        yield chunk.content
+        except Exception as e:
+            logger.error(f"Failed to stream document summary: {e}")
+            return
+        
+        self.cache.put(key, "".join(chunks).strip())
+
 
 # Global client instance
 _gemini_client: Optional[GeminiClient] = None
@@ -0,0 +1,54 @@
+"""
+Application configuration helpers.
+
+Settings are read from the process environment first and then from the
+project's ``.env`` file. The ``.env`` file is parsed only once per process
+and the resulting mapping is shared by every module, instead of each module
+calling ``load_dotenv()`` at import time.
+
+Example:
+--------
+    from src.config import get_env
+
+    database_url = get_env("DATABASE_URL", "sqlite:///./docling.db")
+"""
+
+import os
+from functools import lru_cache
+from typing import Dict, Optional
+
+
+@lru_cache(maxsize=1)
+def load_env() -> Dict[str, Optional[str]]:
+    """
+    Parse the ``.env`` file once and cache the result.
+
+    The file is located the same way ``load_dotenv()`` does it: by walking
+    up from this package towards the filesystem root.
+
+    Returns:
+        Mapping of variable names to values ({} if no .env file exists)
+    """
+    from dotenv import dotenv_values, find_dotenv
+
+    return dotenv_values(find_dotenv())
+
+
+def get_env(key: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    Get a configuration value.
+
+    Variables already set in the process environment take precedence over
+    the ``.env`` file, matching ``load_dotenv()``'s non-override behaviour.
+
+    Args:
+        key: Variable name
+        default: Value returned when the variable is not set anywhere
+
+    Returns:
+        The configured value, or ``default``
+    """
+    value = os.environ.get(key)
+    if value is None:
+        value = load_env().get(key)
+    return default if value is None else value
@@ -1,7 +1,8 @@
 """Make database package importable."""
 
 from .models import Base, Document, Section, ContentBlock
-from .connection import engine, SessionLocal, get_db, get_db_session, init_db
+from .connection import get_engine, get_db, get_db_session, get_async_db, init_db
+from . import connection as _connection
 
 __all__ = [
     "Base",
@@ -10,7 +11,16 @@ __all__ = [
     "ContentBlock",
     "engine",
     "SessionLocal",
+    "get_engine",
     "get_db",
     "get_db_session",
+    "get_async_db",
     "init_db",
 ]
+
+
+def __getattr__(name: str):
+    """Proxy ``engine`` and ``SessionLocal`` so they are only created on first access."""
+    if name in ("engine", "SessionLocal"):
+        return getattr(_connection, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
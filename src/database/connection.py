@@ -47,61 +47,183 @@ cleanup and transaction handling:
 
 Connection Pooling:
 -------------------
-- SQLite: Uses StaticPool (single connection, thread-safe)
+- SQLite: File databases use a QueuePool (DB_POOL_SIZE, default as below)
+  with WAL journaling and synchronous=NORMAL (see SQLITE_PRAGMAS), so
+  readers get their own connections and never wait on the writer;
+  in-memory databases use StaticPool (one shared connection). SQLAlchemy
+  emits BEGIN itself, so SAVEPOINTs (begin_nested()) work with pysqlite
 - PostgreSQL/MySQL: Uses QueuePool with configurable pool size
-    - pool_size: 10 (normal connections)
-    - max_overflow: 20 (additional connections under load)
+    - pool_size: DB_POOL_SIZE, default max(2, CPU count / API_WORKERS) so
+      that all worker processes together hold about one connection per core
+    - max_overflow: DB_MAX_OVERFLOW, default 20 (additional connections under load)
     - pool_pre_ping: True (validates connections before use)
+    - pool_recycle: 1800s, pool_timeout: 10s, TCP keepalives on PostgreSQL
+    - pool_use_lifo: True (hot connections are reused; idle extras can time out)
+- All engines use a 1200-entry compiled statement cache (query_cache_size)
+  and encode/decode JSON columns with orjson when it is installed
+
+Async Sessions:
+---------------
+For async code paths, get_async_db() yields an AsyncSession bound to an
+engine using the async variant of the configured driver (asyncpg for
+PostgreSQL, aiosqlite for SQLite, aiomysql for MySQL). The async engine is
+created on first use, so the driver only needs to be installed when used.
 """
 
 import os
-from typing import Generator
-from sqlalchemy import create_engine
+from functools import lru_cache
+from typing import TYPE_CHECKING, AsyncGenerator, Generator, List
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
-from dotenv import load_dotenv
+from sqlalchemy.pool import QueuePool, StaticPool
 
-from .models import Base
+from src.config import get_env
+from .models import Base, Document, create_document_fts, document_fts_is_current, json_dumps, json_loads
 
-# Load environment variables from .env file
-load_dotenv()
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
-# Get database URL from environment variable
+# Get database URL from environment variable (or .env file)
 # Default to SQLite for development if not specified
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./docling.db")
+DATABASE_URL = get_env("DATABASE_URL", "sqlite:///./docling.db")
 
-# Create database engine with appropriate configuration
-# SQLite configuration (for development and small-scale deployments)
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False},  # Allow multi-threaded access
-        poolclass=StaticPool,  # Single connection pool for SQLite
-        echo=False  # Set to True for SQL query debugging
-    )
-else:
+# Size of SQLAlchemy's compiled statement cache (skips re-compiling hot queries)
+QUERY_CACHE_SIZE = 1200
+
+# Async drivers used in place of the configured sync driver
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+# Applied to every new SQLite connection: foreign keys are off by default in
+# SQLite, and WAL journaling with NORMAL sync only fsyncs at checkpoints
+# instead of on every commit
+SQLITE_PRAGMAS = (
+    "PRAGMA foreign_keys=ON",  # Enforce FKs so ON DELETE CASCADE applies
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA cache_size=-64000",  # 64 MB
+)
+
+# Recycle pooled connections before cloud load balancers drop idle ones
+POOL_RECYCLE_SECONDS = 1800
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Configure journaling and caching on a new SQLite connection."""
+    # Let SQLAlchemy issue BEGIN (see _begin_sqlite) instead of pysqlite's
+    # implicit transactions, which break SAVEPOINT / begin_nested()
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _begin_sqlite(connection) -> None:
+    """Start every SQLAlchemy transaction with an explicit BEGIN on SQLite."""
+    connection.exec_driver_sql("BEGIN")
+
+
+def _default_pool_size() -> int:
+    """Spread roughly one connection per CPU core across all API workers."""
+    workers = max(1, int(get_env("API_WORKERS", "1")))
+    return max(2, (os.cpu_count() or 1) // workers)
+
+
+@lru_cache(maxsize=None)
+def get_engine() -> Engine:
+    """
+    Get the process-wide database engine, creating it on first use.
+    
+    The engine is not created at import time, so importing this module
+    (e.g. in tests or tooling) does not resolve hosts or open connections.
+    
+    Returns:
+        SQLAlchemy Engine configured for DATABASE_URL
+    """
+    # SQLite configuration (for development and small-scale deployments)
+    if DATABASE_URL.startswith("sqlite"):
+        database = make_url(DATABASE_URL).database
+        if not database or database == ":memory:":
+            # Every connection to :memory: is a separate database; share one
+            pool_options = {"poolclass": StaticPool}
+        else:
+            # WAL lets pooled readers proceed while one connection writes
+            pool_options = {
+                "poolclass": QueuePool,
+                "pool_size": int(get_env("DB_POOL_SIZE", str(_default_pool_size()))),
+                "max_overflow": int(get_env("DB_MAX_OVERFLOW", "20")),
+                "pool_use_lifo": True,
+            }
+        engine = create_engine(
+            DATABASE_URL,
+            connect_args={"check_same_thread": False},  # Allow multi-threaded access
+            query_cache_size=QUERY_CACHE_SIZE,
+            json_serializer=json_dumps,
+            json_deserializer=json_loads,
+            echo=False,  # Set to True for SQL query debugging
+            **pool_options
+        )
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        event.listen(engine, "begin", _begin_sqlite)
+        return engine
+    
+    # TCP keepalives stop idle connections being silently dropped (libpq only)
+    connect_args = {}
+    if DATABASE_URL.startswith("postgresql"):
+        connect_args = {"keepalives": 1, "keepalives_idle": 60}
+    
     # PostgreSQL/MySQL configuration (for production deployments)
-    engine = create_engine(
+    return create_engine(
         DATABASE_URL,
         pool_pre_ping=True,  # Verify connections before using (handles stale connections)
-        pool_size=10,  # Number of connections to maintain in the pool
-        max_overflow=20,  # Maximum additional connections under load
+        pool_size=int(get_env("DB_POOL_SIZE", str(_default_pool_size()))),  # Connections kept in the pool
+        max_overflow=int(get_env("DB_MAX_OVERFLOW", "20")),  # Maximum additional connections under load
+        pool_recycle=POOL_RECYCLE_SECONDS,  # Replace connections older than 30 minutes
+        pool_use_lifo=True,  # Reuse the most recently returned (warm) connection first
+        pool_timeout=10,  # Fail fast instead of waiting 30s for a free connection
+        connect_args=connect_args,
+        query_cache_size=QUERY_CACHE_SIZE,
+        json_serializer=json_dumps,
+        json_deserializer=json_loads,
         echo=False  # Set to True for SQL query debugging
     )
 
-# Create session factory
-# Sessions are used for all database operations
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@lru_cache(maxsize=None)
+def _session_factory() -> sessionmaker:
+    """Get the session factory bound to get_engine()."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
 
 
-def init_db():
+def __getattr__(name: str):
+    """Resolve the former module-level ``engine`` and ``SessionLocal`` lazily."""
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return _session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def init_db() -> List[str]:
     """
     Initialize database tables.
     
     Creates all tables defined in the models if they don't already exist.
     This function is idempotent - it's safe to call multiple times.
     
-    The function uses SQLAlchemy's metadata.create_all() which:
+    The live schema is inspected once and only the missing tables are passed
+    to metadata.create_all(), so warm runs (all tables present) return
+    without any CREATE round-trips:
     - Creates tables that don't exist
     - Skips tables that already exist
     - Does NOT modify existing table schemas
@@ -110,6 +232,9 @@ def init_db():
         For schema migrations in production, use Alembic instead of
         calling this function repeatedly.
     
+    Returns:
+        Names of the tables that were created (empty if none were missing)
+    
     Raises:
         SQLAlchemyError: If database connection or table creation fails
     
@@ -117,9 +242,27 @@ def init_db():
         >>> from src.database import init_db
         >>> init_db()
         Database tables created successfully!
+        ['documents', 'sections', 'content_blocks']
     """
-    Base.metadata.create_all(bind=engine)
+    engine = get_engine()
+    existing = set(inspect(engine).get_table_names())
+    missing = [table for table in Base.metadata.sorted_tables if table.name not in existing]
+    
+    # SQLite databases created before the FTS5 search table existed (or with
+    # its earlier rowid-keyed layout) get it, and an index of their current
+    # rows, here
+    if engine.dialect.name == "sqlite" and Document.__tablename__ in existing:
+        with engine.begin() as connection:
+            if not document_fts_is_current(connection):
+                create_document_fts(connection, rebuild=True)
+    
+    if not missing:
+        print("Database tables already exist")
+        return []
+    
+    Base.metadata.create_all(bind=engine, tables=missing)
     print("Database tables created successfully!")
+    return [table.name for table in missing]
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -150,7 +293,7 @@ def get_db() -> Generator[Session, None, None]:
         Do not call db.close() manually when using this with Depends().
         The cleanup is handled automatically in the finally block.
     """
-    db = SessionLocal()
+    db = _session_factory()()
     try:
         yield db
     finally:
@@ -186,4 +329,64 @@ def get_db_session() -> Session:
     See Also:
         get_db(): For use with FastAPI dependency injection
     """
-    return SessionLocal()
+    return _session_factory()()
+
+
+
+@lru_cache(maxsize=1)
+def get_async_sessionmaker():
+    """
+    Get the async session factory, creating the async engine on first use.
+    
+    The async engine mirrors DATABASE_URL with the driver swapped for its
+    async counterpart (see ASYNC_DRIVERS).
+    
+    Returns:
+        async_sessionmaker producing AsyncSession instances
+    
+    Raises:
+        ValueError: If the configured backend has no known async driver
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    
+    url = make_url(DATABASE_URL)
+    async_driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if async_driver is None:
+        raise ValueError(f"No async driver configured for {url.get_backend_name()}")
+    
+    options = {
+        "query_cache_size": QUERY_CACHE_SIZE,
+        "json_serializer": json_dumps,
+        "json_deserializer": json_loads,
+        "echo": False,
+    }
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            pool_pre_ping=True,
+            pool_size=int(get_env("DB_POOL_SIZE", str(_default_pool_size()))),
+            max_overflow=int(get_env("DB_MAX_OVERFLOW", "20")),
+            pool_recycle=POOL_RECYCLE_SECONDS,
+            pool_use_lifo=True,
+        )
+    
+    async_engine = create_async_engine(url.set(drivername=async_driver), **options)
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncGenerator["AsyncSession", None]:
+    """
+    Get an async database session for FastAPI dependency injection.
+    
+    Async counterpart of get_db() for endpoints built on AsyncSession.
+    
+    Yields:
+        AsyncSession: SQLAlchemy async database session
+    
+    Example:
+        >>> @app.get("/items")
+        >>> async def read_items(db: AsyncSession = Depends(get_async_db)):
+        >>>     result = await db.execute(select(Item))
+        >>>     return result.scalars().all()
+    """
+    async with get_async_sessionmaker()() as db:
+        yield db
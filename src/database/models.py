@@ -20,9 +20,10 @@ The database uses a three-tier hierarchy:
 
 Features:
 ---------
-- UUID-based primary keys for distributed systems
+- UUID-based primary keys for distributed systems (native UUID on PostgreSQL)
 - Cascade deletes to maintain referential integrity
-- JSON fields for flexible metadata storage
+- Server-side timestamp defaults (no Python callback per inserted row)
+- JSON fields for flexible metadata storage (JSONB with GIN indexes on PostgreSQL)
 - Indexed fields for optimized queries
 - Support for hierarchical sections with parent-child relationships
 
@@ -48,13 +49,42 @@ Example Usage:
     db.commit()
 """
 
-from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, JSON, Index
+from sqlalchemy import DDL, Column, String, Integer, Text, DateTime, ForeignKey, JSON, Index, event, func
+from sqlalchemy import text as sql_text
 from sqlalchemy.orm import relationship, DeclarativeBase
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+import json
 import uuid
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Native 16-byte UUID on PostgreSQL, 36-char string elsewhere. Values are
+# exchanged as strings on every backend so application code is unchanged.
+UUIDType = String(36).with_variant(UUID(as_uuid=False), "postgresql")
+
+# Binary, indexable JSONB on PostgreSQL; plain JSON elsewhere.
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+def json_dumps(value) -> str:
+    """Serialize a JSON column value (with orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
+
+# Parses JSON column values; orjson.loads accepts str as well as bytes
+json_loads = orjson.loads if orjson is not None else json.loads
+
+# Full-text search expression over content_blocks.text. Queries must use the
+# identical expression for PostgreSQL to pick the expression index.
+CONTENT_TSVECTOR_SQL = "to_tsvector('english', coalesce(text, ''))"
+
 
 class Base(DeclarativeBase):
     """
@@ -66,6 +96,71 @@ class Base(DeclarativeBase):
     pass
 
 
+# Trigram opclasses used by the search indexes below (PostgreSQL only)
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+# SQLite counterpart of the pg_trgm search indexes: an FTS5 table with the
+# trigram tokenizer over documents.title and source_filename, kept in sync
+# by triggers. Rows are keyed by the document id (stored UNINDEXED), not by
+# the implicit rowid of documents, which VACUUM may renumber. Trigram MATCH
+# is a case-insensitive substring search, like ILIKE '%query%', but uses the index.
+DOCUMENT_FTS_TABLE = "documents_fts"
+
+_DOCUMENT_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {DOCUMENT_FTS_TABLE} USING fts5("
+    "id UNINDEXED, title, source_filename, tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {DOCUMENT_FTS_TABLE}_ai AFTER INSERT ON documents BEGIN "
+    f"INSERT INTO {DOCUMENT_FTS_TABLE}(id, title, source_filename) "
+    "VALUES (new.id, new.title, new.source_filename); END",
+    f"CREATE TRIGGER IF NOT EXISTS {DOCUMENT_FTS_TABLE}_ad AFTER DELETE ON documents BEGIN "
+    f"DELETE FROM {DOCUMENT_FTS_TABLE} WHERE id = old.id; END",
+    f"CREATE TRIGGER IF NOT EXISTS {DOCUMENT_FTS_TABLE}_au AFTER UPDATE OF id, title, source_filename "
+    f"ON documents BEGIN "
+    f"UPDATE {DOCUMENT_FTS_TABLE} SET id = new.id, title = new.title, "
+    "source_filename = new.source_filename WHERE id = old.id; END",
+)
+
+# Removes the search table and triggers, including earlier layouts of them
+_DOCUMENT_FTS_DROP = (
+    f"DROP TRIGGER IF EXISTS {DOCUMENT_FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {DOCUMENT_FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {DOCUMENT_FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {DOCUMENT_FTS_TABLE}",
+)
+
+
+def document_fts_is_current(connection) -> bool:
+    """Check whether the SQLite documents_fts table exists with the current (id-keyed) layout."""
+    columns = {row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({DOCUMENT_FTS_TABLE})")}
+    return "id" in columns
+
+
+def create_document_fts(connection, rebuild: bool = False) -> None:
+    """
+    Create the SQLite documents_fts table and its sync triggers (idempotent).
+    
+    Args:
+        connection: SQLAlchemy connection to a SQLite database
+        rebuild: Drop any existing search table and re-index the rows already
+            in documents (needed when the table is added to, or upgraded in,
+            an existing database)
+    """
+    if rebuild:
+        for statement in _DOCUMENT_FTS_DROP:
+            connection.exec_driver_sql(statement)
+    for statement in _DOCUMENT_FTS_DDL:
+        connection.exec_driver_sql(statement)
+    if rebuild:
+        connection.exec_driver_sql(
+            f"INSERT INTO {DOCUMENT_FTS_TABLE}(id, title, source_filename) "
+            "SELECT id, title, source_filename FROM documents"
+        )
+
+
 class Document(Base):
     """
     Document model representing a processed document.
@@ -99,12 +194,17 @@ class Document(Base):
     Relationships:
     --------------
     sections : List[Section]
-        All sections belonging to this document (cascade delete enabled)
+        All sections belonging to this document, by order (cascade delete enabled)
     
     Indexes:
     --------
     - idx_document_title: For fast title-based searches
     - idx_document_created_at: For sorting by creation date
+    - idx_document_meta_gin: GIN index on doc_metadata (PostgreSQL only)
+    - idx_document_title_trgm, idx_document_source_trgm: pg_trgm GIN indexes
+      serving ILIKE '%query%' searches (PostgreSQL only)
+    - documents_fts: FTS5 trigram table over title and source_filename,
+      serving the same searches (SQLite only, see create_document_fts)
     
     Example:
     --------
@@ -121,27 +221,41 @@ class Document(Base):
     
     __tablename__ = "documents"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDType, primary_key=True, default=lambda: str(uuid.uuid4()))
     title = Column(String(500), nullable=False)
     source_filename = Column(String(500), nullable=False)
     file_path = Column(String(1000), nullable=True)
-    doc_metadata = Column(JSON, nullable=True)  # Stores page_headers, page_footers, etc.
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    doc_metadata = Column(JSONType, nullable=True)  # Stores page_headers, page_footers, etc.
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
-    sections = relationship("Section", back_populates="document", cascade="all, delete-orphan")
+    # Loaded in document order; the ORDER BY is served by idx_section_doc_parent_order
+    sections = relationship("Section", back_populates="document", cascade="all, delete-orphan",
+                            passive_deletes=True, order_by="Section.order")
     
     # Indexes
     __table_args__ = (
         Index('idx_document_title', 'title'),
         Index('idx_document_created_at', 'created_at'),
+        Index('idx_document_meta_gin', 'doc_metadata', postgresql_using='gin').ddl_if(dialect='postgresql'),
+        Index('idx_document_title_trgm', 'title', postgresql_using='gin',
+              postgresql_ops={'title': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        Index('idx_document_source_trgm', 'source_filename', postgresql_using='gin',
+              postgresql_ops={'source_filename': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
     )
     
     def __repr__(self):
         return f"<Document(id={self.id}, title={self.title})>"
 
 
+@event.listens_for(Document.__table__, "after_create")
+def _create_document_fts(target, connection, **kw) -> None:
+    """Add the FTS5 search table whenever documents is created on SQLite."""
+    if connection.dialect.name == "sqlite":
+        create_document_fts(connection)
+
+
 class Section(Base):
     """
     Section model representing hierarchical document sections.
@@ -170,17 +284,16 @@ class Section(Base):
     document : Document
         The document this section belongs to
     parent : Section, optional
-        Parent section (None for top-level sections)
+        Parent section (None for top-level sections); lazy loading raises
     children : List[Section]
-        Child sections (subsections)
+        Child sections (subsections), by order; lazy loading raises, use selectinload
     content_blocks : List[ContentBlock]
-        Content elements within this section (cascade delete enabled)
+        Content elements within this section, by order (cascade delete enabled)
     
     Indexes:
     --------
-    - idx_section_document_id: For finding all sections in a document
+    - idx_section_doc_parent_order: For reading a document's section tree level by level, in order
     - idx_section_parent_id: For finding child sections
-    - idx_section_order: For maintaining correct section order
     
     Example:
     --------
@@ -204,23 +317,28 @@ class Section(Base):
     
     __tablename__ = "sections"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    document_id = Column(String(36), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
-    parent_id = Column(String(36), ForeignKey("sections.id", ondelete="CASCADE"), nullable=True)
+    id = Column(UUIDType, primary_key=True, default=lambda: str(uuid.uuid4()))
+    document_id = Column(UUIDType, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
+    parent_id = Column(UUIDType, ForeignKey("sections.id", ondelete="CASCADE"), nullable=True)
     title = Column(String(1000), nullable=False)
     level = Column(Integer, nullable=True)
     order = Column(Integer, nullable=False)
     
     # Relationships
     document = relationship("Document", back_populates="sections")
-    parent = relationship("Section", remote_side=[id], backref="children")
-    content_blocks = relationship("ContentBlock", back_populates="section", cascade="all, delete-orphan")
+    # Self-referential links raise instead of lazy loading (one SELECT per
+    # section); load them explicitly, e.g. selectinload(Section.children)
+    parent = relationship("Section", remote_side=[id], back_populates="children", lazy="raise")
+    children = relationship("Section", back_populates="parent", lazy="raise", passive_deletes=True,
+                            order_by="Section.order")
+    # Loaded in document order; the ORDER BY is served by idx_content_section_order
+    content_blocks = relationship("ContentBlock", back_populates="section", cascade="all, delete-orphan",
+                                  passive_deletes=True, order_by="ContentBlock.order")
     
     # Indexes
     __table_args__ = (
-        Index('idx_section_document_id', 'document_id'),
+        Index('idx_section_doc_parent_order', 'document_id', 'parent_id', 'order'),
         Index('idx_section_parent_id', 'parent_id'),
-        Index('idx_section_order', 'order'),
     )
     
     def __repr__(self):
@@ -239,6 +357,9 @@ class ContentBlock(Base):
     -----------
     id : str
         UUID primary key for the content block
+    document_id : str
+        Foreign key to the owning document (set for every block, including
+        document-level content; also the natural partition key)
     section_id : str, optional
         Foreign key to parent section (None for document-level content)
     type : str
@@ -265,14 +386,19 @@ class ContentBlock(Base):
     
     Indexes:
     --------
-    - idx_content_section_id: For finding all content in a section
+    - idx_content_document_id: For document-scoped queries and cascade deletes
+    - idx_content_section_order: For reading a section's content in order
     - idx_content_type: For filtering by content type (e.g., all tables)
-    - idx_content_order: For maintaining correct content order
+    - idx_block_meta_gin: GIN index for metadata filters such as page_no (PostgreSQL only)
+    - idx_content_text_trgm: pg_trgm GIN index serving ILIKE text search (PostgreSQL only)
+    - idx_content_text_tsv: GIN index on the English tsvector of text, used by
+      full-text search (PostgreSQL only)
     
     Example:
     --------
         # Text block
         text_block = ContentBlock(
+            document_id=doc.id,
             section_id=section.id,
             type='text',
             text='This is a paragraph of text.',
@@ -281,6 +407,7 @@ class ContentBlock(Base):
         
         # Table block with AI summary
         table_block = ContentBlock(
+            document_id=doc.id,
             section_id=section.id,
             type='table',
             src='output/doc_123/tables/table_001.csv',
@@ -297,23 +424,29 @@ class ContentBlock(Base):
     
     __tablename__ = "content_blocks"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    section_id = Column(String(36), ForeignKey("sections.id", ondelete="CASCADE"), nullable=True)
+    id = Column(UUIDType, primary_key=True, default=lambda: str(uuid.uuid4()))
+    document_id = Column(UUIDType, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
+    section_id = Column(UUIDType, ForeignKey("sections.id", ondelete="CASCADE"), nullable=True)
     type = Column(String(50), nullable=False)  # text, image, table, etc.
     text = Column(Text, nullable=True)
     src = Column(String(1000), nullable=True)  # Path to image/table file
-    block_metadata = Column(JSON, nullable=True)  # Stores columns, rows, captions, AI summaries, etc.
+    block_metadata = Column(JSONType, nullable=True)  # Stores columns, rows, captions, AI summaries, etc.
     order = Column(Integer, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships
     section = relationship("Section", back_populates="content_blocks")
     
     # Indexes
     __table_args__ = (
-        Index('idx_content_section_id', 'section_id'),
+        Index('idx_content_document_id', 'document_id'),
+        Index('idx_content_section_order', 'section_id', 'order'),
         Index('idx_content_type', 'type'),
-        Index('idx_content_order', 'order'),
+        Index('idx_block_meta_gin', 'block_metadata', postgresql_using='gin').ddl_if(dialect='postgresql'),
+        Index('idx_content_text_trgm', 'text', postgresql_using='gin',
+              postgresql_ops={'text': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        Index('idx_content_text_tsv', sql_text(CONTENT_TSVECTOR_SQL),
+              postgresql_using='gin').ddl_if(dialect='postgresql'),
     )
     
     def __repr__(self):
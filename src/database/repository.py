@@ -38,11 +38,64 @@ Example Usage:
     db.close()
 """
 
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, desc
+import io
+import uuid
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Tuple
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import Table, bindparam, delete, or_, desc, func, literal_column, select
+from sqlalchemy import text as sql_text
 
-from .models import Document, Section, ContentBlock
+from .models import CONTENT_TSVECTOR_SQL, DOCUMENT_FTS_TABLE, Document, Section, ContentBlock, json_dumps
+
+# Shared read-only default for nodes without a "metadata" dict
+EMPTY: Dict[str, Any] = {}
+
+# Rows fetched per batch by streaming list/search queries
+YIELD_PER = 100
+
+# Execution options for streaming list/search queries (server-side cursor)
+_STREAM_OPTIONS = {"stream_results": True, "yield_per": YIELD_PER}
+
+# Estimated row count below which count_approx() returns the exact count
+APPROX_COUNT_THRESHOLD = 100_000
+
+# Shortest query searched through the SQLite FTS5 trigram index (trigram
+# MATCH needs at least three characters; shorter queries use LIKE)
+FTS_MIN_QUERY_LENGTH = 3
+
+# Row count above which PostgreSQL ingests use COPY instead of INSERT
+COPY_THRESHOLD = 500
+
+# Characters escaped in COPY text format
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _insert_ignoring_conflicts(db: Session, table: Table):
+    """
+    Build an INSERT for table that skips rows whose primary key already exists.
+    
+    Uses ON CONFLICT DO NOTHING on PostgreSQL and SQLite and INSERT IGNORE on
+    MySQL, so re-ingesting the same rows needs no existence check first.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(table).on_conflict_do_nothing(index_elements=["id"])
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(table).on_conflict_do_nothing(index_elements=["id"])
+    if dialect in ("mysql", "mariadb"):
+        return table.insert().prefix_with("IGNORE")
+    return table.insert()
+
+
+def _copy_value(value: Any) -> str:
+    """Format a value as a PostgreSQL COPY text-format field."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, (dict, list)):
+        value = json_dumps(value)
+    return str(value).translate(_COPY_ESCAPES)
 
 
 class DocumentRepository:
@@ -73,6 +126,39 @@ class DocumentRepository:
         >>> print(f"Sections: {len(doc.sections)}")
     """
     
+    # Statements built once with bind parameters, so each call only binds
+    # values and hits SQLAlchemy's compiled statement cache
+    _LIST_STMT = select(Document).order_by(
+        desc(Document.created_at)
+    ).offset(bindparam("skip")).limit(bindparam("limit"))
+    
+    # Search responses include each document's tree; selectinload fetches it
+    # with one IN query per level per YIELD_PER batch instead of lazily per row
+    _SEARCH_STMT = select(Document).options(
+        selectinload(Document.sections).selectinload(Section.content_blocks)
+    ).where(
+        or_(
+            Document.title.ilike(bindparam("pattern")),
+            Document.source_filename.ilike(bindparam("pattern"))
+        )
+    ).order_by(
+        desc(Document.created_at)
+    ).offset(bindparam("skip")).limit(bindparam("limit"))
+    
+    # SQLite variant of _SEARCH_STMT matching through the documents_fts
+    # trigram index instead of scanning with LIKE
+    _FTS_SEARCH_STMT = select(Document).options(
+        selectinload(Document.sections).selectinload(Section.content_blocks)
+    ).where(
+        Document.id.in_(
+            sql_text(
+                f"SELECT id FROM {DOCUMENT_FTS_TABLE} WHERE {DOCUMENT_FTS_TABLE} MATCH :match"
+            ).columns(literal_column("id"))
+        )
+    ).order_by(
+        desc(Document.created_at)
+    ).offset(bindparam("skip")).limit(bindparam("limit"))
+    
     def __init__(self, db: Session):
         """
         Initialize the repository with a database session.
@@ -92,6 +178,11 @@ class DocumentRepository:
         - All nested sections (with parent-child relationships)
         - All content blocks (text, images, tables)
         
+        Ingest is idempotent: if a document with the same ID already exists
+        (e.g. a retried pipeline run), nothing is inserted and the existing
+        document is returned. All rows are written with conflict-ignoring
+        Core INSERTs, so no existence SELECT is issued first.
+        
         The method handles the complexity of:
         - Recursive section processing
         - Maintaining correct order of sections and content
@@ -108,7 +199,7 @@ class DocumentRepository:
                 - children: List of sections and content blocks
         
         Returns:
-            Document: The created Document instance with all relationships loaded
+            Document: The created (or already existing) Document instance
         
         Raises:
             SQLAlchemyError: If database operation fails
@@ -126,93 +217,287 @@ class DocumentRepository:
             >>> doc = repo.create_from_json(json_data)
             >>> print(f"Created: {doc.title}")
         """
-        # Create document
-        document = Document(
-            id=json_data.get("id"),
-            title=json_data.get("title", "Untitled"),
-            source_filename=json_data.get("metadata", {}).get("source", "unknown"),
-            doc_metadata={
+        section_rows: List[Dict[str, Any]] = []
+        content_rows: List[Dict[str, Any]] = []
+        document_row = self._collect_rows(json_data, section_rows, content_rows)
+        
+        result = self.db.execute(_insert_ignoring_conflicts(self.db, Document.__table__), document_row)
+        if result.rowcount:
+            self._insert_rows(section_rows, content_rows)
+        
+        self.db.commit()
+        return self.db.get(Document, document_row["id"])
+    
+    def create_many_from_json(self, docs: List[Dict[str, Any]], synchronous_commit: bool = True) -> List[Document]:
+        """
+        Create several documents in a single transaction.
+        
+        Works like create_from_json() for each item, but all documents share
+        one bulk insert per table and one commit, so per-commit overhead (the
+        WAL fsync on PostgreSQL) is paid once per batch instead of once per
+        document. Documents whose ID already exists are skipped.
+        
+        Args:
+            docs: Hierarchical JSON structures from transformer.py
+            synchronous_commit: Set to False to skip the WAL flush wait for
+                this transaction on PostgreSQL (faster; a crash right after
+                commit may lose the batch). Ignored on other backends.
+        
+        Returns:
+            The created (or already existing) Document instances, in input order
+        
+        Raises:
+            SQLAlchemyError: If database operation fails (nothing is committed)
+        
+        Example:
+            >>> documents = repo.create_many_from_json([json_a, json_b, json_c])
+            >>> print(f"Created {len(documents)} documents")
+        """
+        if not docs:
+            return []
+        
+        if not synchronous_commit and self.db.get_bind().dialect.name == "postgresql":
+            self.db.execute(sql_text("SET LOCAL synchronous_commit = off"))
+        
+        # One lookup per batch finds documents ingested by an earlier run
+        given_ids = [json_data["id"] for json_data in docs if json_data.get("id")]
+        existing = set(self.db.execute(
+            select(Document.id).where(Document.id.in_(given_ids))
+        ).scalars()) if given_ids else set()
+        
+        document_rows: List[Dict[str, Any]] = []
+        section_rows: List[Dict[str, Any]] = []
+        content_rows: List[Dict[str, Any]] = []
+        ids: List[str] = []
+        for json_data in docs:
+            if json_data.get("id") in existing:
+                ids.append(json_data["id"])
+                continue
+            document_row = self._collect_rows(json_data, section_rows, content_rows)
+            existing.add(document_row["id"])
+            document_rows.append(document_row)
+            ids.append(document_row["id"])
+        
+        if document_rows:
+            self.db.execute(_insert_ignoring_conflicts(self.db, Document.__table__), document_rows)
+            self._insert_rows(section_rows, content_rows)
+        
+        self.db.commit()
+        loaded = {
+            document.id: document
+            for document in self.db.execute(select(Document).where(Document.id.in_(ids))).scalars()
+        }
+        return [loaded[document_id] for document_id in ids]
+    
+    def _collect_rows(self, json_data: Dict[str, Any], section_rows: List[Dict[str, Any]],
+                      content_rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build a document's row and collect its section and content rows.
+        
+        Args:
+            json_data: Hierarchical JSON structure from transformer.py
+            section_rows: Output list receiving the document's section rows
+            content_rows: Output list receiving the document's content block rows
+        
+        Returns:
+            The documents table row (ID assigned up front so children can reference it)
+        """
+        metadata = json_data.get("metadata") or EMPTY
+        document_row = {
+            "id": json_data.get("id") or str(uuid.uuid4()),
+            "title": json_data.get("title", "Untitled"),
+            "source_filename": metadata.get("source", "unknown"),
+            "doc_metadata": {
                 "page_headers": json_data.get("page_headers", []),
                 "page_footers": json_data.get("page_footers", []),
-                "page_count": json_data.get("metadata", {}).get("page_count", 0)
+                "page_count": metadata.get("page_count", 0)
             }
-        )
-        self.db.add(document)
+        }
+        
+        # Collect section and content block rows in one walk; IDs are
+        # generated client-side, so no flush is needed between levels
+        add_section = section_rows.append
+        add_content = content_rows.append
+        for is_section, row in self._iter_rows(json_data.get("children", []), document_row["id"], None):
+            if is_section:
+                add_section(row)
+            else:
+                add_content(row)
+        return document_row
+    
+    def _insert_rows(self, section_rows: List[Dict[str, Any]], content_rows: List[Dict[str, Any]]):
+        """Bulk insert collected section and content rows (their documents must already be inserted)."""
+        # Parents precede children in section_rows, so one executemany
+        # satisfies the parent_id foreign key
+        if section_rows and not self._bulk_copy(Section.__table__, section_rows):
+            self.db.execute(_insert_ignoring_conflicts(self.db, Section.__table__), section_rows)
+        if not self._bulk_copy(ContentBlock.__table__, content_rows):
+            ContentRepository(self.db).bulk_insert_content_blocks(content_rows, commit=False)
+    
+    def _bulk_copy(self, table: Table, rows: List[Dict[str, Any]]) -> bool:
+        """
+        Load rows with PostgreSQL COPY when the batch is large enough.
         
-        # Process children recursively
-        self._process_children(json_data.get("children", []), document.id, None, 0)
+        COPY skips per-statement parsing and planning, which makes it several
+        times faster than INSERT for documents with thousands of blocks. Rows
+        are streamed in COPY text format; JSON columns are serialized with
+        json_dumps and omitted columns (e.g. created_at) get server defaults.
         
-        self.db.commit()
-        self.db.refresh(document)
-        return document
+        COPY cannot skip conflicting rows, so the rows are copied into a
+        temporary staging table and moved with INSERT ... ON CONFLICT (id)
+        DO NOTHING, keeping ingest idempotent like the INSERT path.
+        
+        Args:
+            table: Target table
+            rows: Column-name to value dicts; every dict must have the same keys
+                and include the primary key
+        
+        Returns:
+            True if the rows were copied, False if the caller should insert
+            them normally (not PostgreSQL/psycopg2, or COPY_THRESHOLD rows or fewer)
+        """
+        if len(rows) <= COPY_THRESHOLD:
+            return False
+        
+        dialect = self.db.get_bind().dialect
+        if dialect.name != "postgresql":
+            return False
+        
+        cursor = self.db.connection().connection.cursor()
+        try:
+            if not hasattr(cursor, "copy_expert"):
+                return False
+            
+            columns = list(rows[0])
+            buffer = io.StringIO()
+            write = buffer.write
+            for row in rows:
+                write("\t".join([_copy_value(row[column]) for column in columns]))
+                write("\n")
+            buffer.seek(0)
+            
+            quote = dialect.identifier_preparer.quote
+            target = quote(table.name)
+            staging = quote(f"_copy_{table.name}")
+            column_list = ", ".join(quote(c) for c in columns)
+            # On failure the transaction is rolled back, which also removes
+            # the staging table
+            cursor.execute(f"CREATE TEMP TABLE {staging} (LIKE {target} INCLUDING DEFAULTS) ON COMMIT DROP")
+            cursor.copy_expert(f"COPY {staging} ({column_list}) FROM STDIN", buffer)
+            cursor.execute(
+                f"INSERT INTO {target} ({column_list}) SELECT {column_list} FROM {staging} "
+                "ON CONFLICT (id) DO NOTHING"
+            )
+            # Dropped now (not only at commit) so another batch in the same
+            # transaction can stage into the same name
+            cursor.execute(f"DROP TABLE {staging}")
+        finally:
+            cursor.close()
+        return True
     
-    def _process_children(self, children: List[Dict], document_id: str, parent_section_id: Optional[str], order_offset: int):
+    def _iter_rows(self, children: List[Dict], document_id: str,
+                   parent_section_id: Optional[str]) -> Iterator[Tuple[bool, Dict[str, Any]]]:
         """
-        Recursively process children nodes (sections and content blocks).
+        Walk children nodes, yielding section and content block rows.
         
-        This private method handles the recursive traversal of the document
-        hierarchy, creating Section and ContentBlock records as it goes.
+        This private generator handles the traversal of the document
+        hierarchy. Nothing is added to the session; the caller collects the
+        rows and inserts each table in a single bulk statement.
+        
+        The walk is iterative (an explicit stack of per-level iterators), so
+        deeply nested documents cannot hit the recursion limit, while rows
+        are still produced in depth-first document order.
         
         The method:
         - Distinguishes between sections and content blocks
-        - Creates sections and recursively processes their children
-        - Creates content blocks with appropriate metadata
+        - Yields each section row before the rows of its children
+        - Builds content block rows with appropriate metadata
         - Maintains correct ordering within each level
         
         Args:
             children: List of child nodes (sections or content blocks)
             document_id: UUID of the parent document
             parent_section_id: UUID of the parent section (None for top-level)
-            order_offset: Starting order number for this level
+        
+        Yields:
+            Tuples of (is_section, row) where row maps column names to values
         
         Note:
             This is a private method called internally by create_from_json().
-            It uses db.flush() to get section IDs before processing children.
+            IDs are generated here when the JSON has none, so child rows can
+            reference their parent without a flush.
         """
-        for idx, child in enumerate(children):
-            child_type = child.get("type")
-            order = order_offset + idx
+        new_id = uuid.uuid4
+        stack = [(enumerate(children), parent_section_id)]
+        push = stack.append
+        
+        while stack:
+            level, parent_section_id = stack[-1]
+            item = next(level, None)
+            if item is None:
+                stack.pop()
+                continue
+            
+            order, child = item
+            get = child.get
+            child_type = get("type")
             
             if child_type == "section":
-                # Create section
-                section = Section(
-                    id=child.get("id"),
-                    document_id=document_id,
-                    parent_id=parent_section_id,
-                    title=child.get("title", "Untitled Section"),
-                    level=child.get("level"),
-                    order=order
-                )
-                self.db.add(section)
-                self.db.flush()  # Get the section ID
+                # Section row
+                section_id = get("id") or str(new_id())
+                yield True, {
+                    "id": section_id,
+                    "document_id": document_id,
+                    "parent_id": parent_section_id,
+                    "title": get("title", "Untitled Section"),
+                    "level": get("level"),
+                    "order": order
+                }
                 
-                # Process section's children
-                self._process_children(child.get("children", []), document_id, section.id, 0)
+                # Descend into the section's children before its next sibling
+                push((enumerate(get("children", ())), section_id))
             
             else:
-                # Create content block (text, image, table, etc.)
-                content = ContentBlock(
-                    id=child.get("id"),
-                    section_id=parent_section_id,
-                    type=child_type,
-                    text=child.get("text"),
-                    src=child.get("src"),
-                    block_metadata={
-                        "caption": child.get("caption"),
-                        "columns": child.get("columns"),
-                        "rows": child.get("rows"),
-                        "page_no": child.get("metadata", {}).get("page_no")
+                # Content block row (text, image, table, etc.)
+                yield False, {
+                    "id": get("id") or str(new_id()),
+                    "document_id": document_id,
+                    "section_id": parent_section_id,
+                    "type": child_type,
+                    "text": get("text"),
+                    "src": get("src"),
+                    "block_metadata": {
+                        "caption": get("caption"),
+                        "columns": get("columns"),
+                        "rows": get("rows"),
+                        "page_no": (get("metadata") or EMPTY).get("page_no")
                     },
-                    order=order
-                )
-                self.db.add(content)
+                    "order": order
+                }
+    
+    def _is_valid_id(self, document_id: str) -> bool:
+        """
+        Check whether an ID can be compared against the primary key column.
+        
+        On PostgreSQL, IDs are native UUIDs and a malformed string would make
+        the query fail with a cast error, so it is rejected up front. Other
+        backends store IDs as strings and accept any value.
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return True
+        try:
+            uuid.UUID(str(document_id))
+        except ValueError:
+            return False
+        return True
     
     def get_by_id(self, document_id: str) -> Optional[Document]:
         """
         Get document by ID with all relationships eagerly loaded.
         
-        Uses SQLAlchemy's joinedload to eagerly load all sections and their
-        content blocks in a single query, avoiding N+1 query problems.
+        Uses SQLAlchemy's selectinload to eagerly load all sections and their
+        content blocks with one extra IN query per level, avoiding both N+1
+        queries and the sections x blocks row blow-up of a joined load.
         
         Args:
             document_id: UUID of the document to retrieve
@@ -228,11 +513,13 @@ class DocumentRepository:
             >>>         for block in section.content_blocks:
             >>>             print(f"  - {block.type}")
         """
+        if not self._is_valid_id(document_id):
+            return None
         return self.db.query(Document).options(
-            joinedload(Document.sections).joinedload(Section.content_blocks)
+            selectinload(Document.sections).selectinload(Section.content_blocks)
         ).filter(Document.id == document_id).first()
     
-    def list_all(self, skip: int = 0, limit: int = 100) -> List[Document]:
+    def list_all(self, skip: int = 0, limit: int = 100) -> Iterable[Document]:
         """
         List all documents with pagination, ordered by creation date (newest first).
         
@@ -241,34 +528,64 @@ class DocumentRepository:
             limit: Maximum number of records to return
         
         Returns:
-            List of Document instances
+            Iterable of Document instances, fetched in batches of YIELD_PER
+            while iterating (use list() to materialize)
         
         Example:
             >>> # Get first page
-            >>> docs = repo.list_all(skip=0, limit=10)
+            >>> docs = list(repo.list_all(skip=0, limit=10))
             >>> 
             >>> # Get second page
-            >>> docs = repo.list_all(skip=10, limit=10)
+            >>> docs = list(repo.list_all(skip=10, limit=10))
+        """
+        return self.db.execute(
+            self._LIST_STMT, {"skip": skip, "limit": limit}, execution_options=_STREAM_OPTIONS
+        ).scalars()
+    
+    def list_all_with_sections(self, skip: int = 0, limit: int = 100) -> List[Document]:
+        """
+        List documents like list_all(), with sections and content blocks eagerly loaded.
+        
+        Use this when the full tree of every listed document is needed (e.g.
+        for serialization); sections and blocks for the whole page are fetched
+        with one selectinload query per level instead of lazily per document.
+        
+        Args:
+            skip: Number of records to skip (for pagination)
+            limit: Maximum number of records to return
+        
+        Returns:
+            List of Document instances with relationships loaded
         """
-        return self.db.query(Document).order_by(
+        return self.db.query(Document).options(
+            selectinload(Document.sections).selectinload(Section.content_blocks)
+        ).order_by(
             desc(Document.created_at)
         ).offset(skip).limit(limit).all()
     
-    def search(self, query: str, skip: int = 0, limit: int = 100) -> List[Document]:
+    def search(self, query: str, skip: int = 0, limit: int = 100) -> Iterable[Document]:
         """
         Search documents by title or source filename (case-insensitive).
         
+        Results are ordered by creation date (newest first), with sections
+        and content blocks eagerly loaded (see list_all_with_sections()).
+        
         Uses SQL ILIKE for case-insensitive pattern matching. Searches in:
         - Document title
         - Source filename
         
+        On SQLite, queries of at least FTS_MIN_QUERY_LENGTH characters without
+        LIKE wildcards (% or _) are matched through the documents_fts trigram
+        index instead, with the same substring semantics.
+        
         Args:
             query: Search term (partial matches supported)
             skip: Number of records to skip (for pagination)
             limit: Maximum number of records to return
         
         Returns:
-            List of matching Document instances
+            Iterable of matching Document instances, fetched in batches of
+            YIELD_PER while iterating (use list() to materialize)
         
         Example:
             >>> # Find all documents with "report" in title or filename
@@ -276,21 +593,30 @@ class DocumentRepository:
             >>> for doc in results:
             >>>     print(f"{doc.title} ({doc.source_filename})")
         """
-        search_pattern = f"%{query}%"
-        return self.db.query(Document).filter(
-            or_(
-                Document.title.ilike(search_pattern),
-                Document.source_filename.ilike(search_pattern)
-            )
-        ).offset(skip).limit(limit).all()
+        if (len(query) >= FTS_MIN_QUERY_LENGTH and "%" not in query and "_" not in query
+                and self.db.get_bind().dialect.name == "sqlite"):
+            # Quoted as one FTS5 phrase, so the query is matched literally
+            phrase = '"' + query.replace('"', '""') + '"'
+            return self.db.execute(
+                self._FTS_SEARCH_STMT,
+                {"match": phrase, "skip": skip, "limit": limit},
+                execution_options=_STREAM_OPTIONS
+            ).scalars()
+        
+        return self.db.execute(
+            self._SEARCH_STMT,
+            {"pattern": f"%{query}%", "skip": skip, "limit": limit},
+            execution_options=_STREAM_OPTIONS
+        ).scalars()
     
     def delete(self, document_id: str) -> bool:
         """
         Delete a document and all its related data (cascade delete).
         
-        Due to cascade delete relationships, this will automatically delete:
+        Issues a single DELETE without loading the document tree. The
+        database's ON DELETE CASCADE foreign keys then remove:
         - All sections belonging to the document
-        - All content blocks within those sections
+        - All content blocks of the document, including document-level ones
         
         Args:
             document_id: UUID of the document to delete
@@ -304,12 +630,14 @@ class DocumentRepository:
             >>> else:
             >>>     print("Document not found")
         """
-        document = self.get_by_id(document_id)
-        if document:
-            self.db.delete(document)
-            self.db.commit()
-            return True
-        return False
+        if not self._is_valid_id(document_id):
+            return False
+        result = self.db.execute(
+            delete(Document).where(Document.id == document_id),
+            execution_options={"synchronize_session": False}
+        )
+        self.db.commit()
+        return result.rowcount > 0
     
     def count(self) -> int:
         """
@@ -323,6 +651,29 @@ class DocumentRepository:
             >>> print(f"Total documents: {total}")
         """
         return self.db.query(Document).count()
+    
+    def count_approx(self) -> int:
+        """
+        Get an approximate number of documents in constant time.
+        
+        On PostgreSQL this reads the planner's row estimate (pg_class.reltuples,
+        kept current by autovacuum/ANALYZE) instead of scanning the table.
+        Small tables (estimate below APPROX_COUNT_THRESHOLD), tables that were
+        never analyzed and other backends get the exact count().
+        
+        Returns:
+            Estimated total document count
+        
+        Example:
+            >>> print(f"About {repo.count_approx()} documents")
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            estimate = self.db.execute(sql_text(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"
+            ), {"table": Document.__tablename__}).scalar()
+            if estimate is not None and estimate >= APPROX_COUNT_THRESHOLD:
+                return estimate
+        return self.count()
 
 
 class ContentRepository:
@@ -345,6 +696,15 @@ class ContentRepository:
         >>>     print(table.block_metadata.get("caption"))
     """
     
+    # Statements built once with bind parameters (see DocumentRepository)
+    _BY_TYPE_STMT = select(ContentBlock).where(
+        ContentBlock.type == bindparam("content_type")
+    ).offset(bindparam("skip")).limit(bindparam("limit"))
+    
+    _SEARCH_TEXT_STMT = select(ContentBlock).where(
+        ContentBlock.text.ilike(bindparam("pattern"))
+    ).offset(bindparam("skip")).limit(bindparam("limit"))
+    
     def __init__(self, db: Session):
         """
         Initialize the repository with a database session.
@@ -354,6 +714,40 @@ class ContentRepository:
         """
         self.db = db
     
+    def bulk_insert_content_blocks(self, rows: List[Dict[str, Any]], commit: bool = True) -> List[str]:
+        """
+        Insert many content blocks with a single Core INSERT statement.
+        
+        Bypasses the ORM unit of work (no identity map, no per-row flush),
+        which is considerably faster for documents with hundreds of blocks.
+        Rows whose ID already exists are skipped.
+        IDs are filled in Python so no per-row default callbacks run
+        during the insert; created_at is set by the database.
+        
+        Args:
+            rows: Column-name to value dicts; every dict must have the same keys
+            commit: Commit the session after inserting
+        
+        Returns:
+            IDs of the inserted content blocks, in input order
+        
+        Example:
+            >>> ids = content_repo.bulk_insert_content_blocks([
+            >>>     {"document_id": doc.id, "section_id": section.id, "type": "text", "text": "Hello", "order": 0}
+            >>> ])
+        """
+        if not rows:
+            return []
+        
+        for row in rows:
+            if not row.get("id"):
+                row["id"] = str(uuid.uuid4())
+        
+        self.db.execute(_insert_ignoring_conflicts(self.db, ContentBlock.__table__), rows)
+        if commit:
+            self.db.commit()
+        return [row["id"] for row in rows]
+    
     def search_by_type(self, content_type: str, skip: int = 0, limit: int = 100) -> List[ContentBlock]:
         """
         Search content blocks by type (e.g., 'table', 'image', 'text').
@@ -377,11 +771,13 @@ class ContentRepository:
             >>> # Get all images
             >>> images = content_repo.search_by_type("image")
         """
-        return self.db.query(ContentBlock).filter(
-            ContentBlock.type == content_type
-        ).offset(skip).limit(limit).all()
+        return self.db.execute(
+            self._BY_TYPE_STMT,
+            {"content_type": content_type, "skip": skip, "limit": limit},
+            execution_options={"stream_results": True}
+        ).scalars().all()
     
-    def search_text(self, query: str, skip: int = 0, limit: int = 100) -> List[ContentBlock]:
+    def search_text(self, query: str, skip: int = 0, limit: int = 100) -> Iterable[ContentBlock]:
         """
         Full-text search in content blocks (case-insensitive).
         
@@ -394,7 +790,8 @@ class ContentRepository:
             limit: Maximum number of records to return
         
         Returns:
-            List of ContentBlock instances with matching text
+            Iterable of ContentBlock instances with matching text, fetched in
+            batches of YIELD_PER while iterating (use list() to materialize)
         
         Example:
             >>> # Find all content mentioning "revenue"
@@ -402,7 +799,39 @@ class ContentRepository:
             >>> for block in results:
             >>>     print(f"{block.type}: {block.text[:100]}...")
         """
-        search_pattern = f"%{query}%"
+        return self.db.execute(
+            self._SEARCH_TEXT_STMT,
+            {"pattern": f"%{query}%", "skip": skip, "limit": limit},
+            execution_options=_STREAM_OPTIONS
+        ).scalars()
+    
+    def search_text_fts(self, query: str, skip: int = 0, limit: int = 100) -> Iterable[ContentBlock]:
+        """
+        Full-text search in content blocks using PostgreSQL text search.
+        
+        Matches English lexemes (so "reports" finds "report") via the
+        idx_content_text_tsv GIN index, and orders results by relevance.
+        On other backends this falls back to search_text().
+        
+        Args:
+            query: Search words (plain text, no operators needed)
+            skip: Number of records to skip (for pagination)
+            limit: Maximum number of records to return
+        
+        Returns:
+            Iterable of matching ContentBlock instances, best matches first
+        
+        Example:
+            >>> results = content_repo.search_text_fts("quarterly revenue")
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return self.search_text(query, skip=skip, limit=limit)
+        
+        # Must match the indexed expression exactly for the index to be used
+        vector = literal_column(CONTENT_TSVECTOR_SQL)
+        tsquery = func.plainto_tsquery("english", query)
         return self.db.query(ContentBlock).filter(
-            ContentBlock.text.ilike(search_pattern)
-        ).offset(skip).limit(limit).all()
+            vector.op("@@")(tsquery)
+        ).order_by(
+            desc(func.ts_rank(vector, tsquery))
+        ).offset(skip).limit(limit).execution_options(stream_results=True).yield_per(YIELD_PER)
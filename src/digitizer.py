@@ -1,11 +1,16 @@
 """Minimal document digitization script with GPU support."""
 
 import argparse
+import itertools
 import json
+import multiprocessing as mp
 import os
+import queue
 import sys
 import time
 import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -26,23 +31,50 @@ except ImportError:
 try:
     from docling.document_converter import DocumentConverter, PdfFormatOption
     from docling.datamodel.pipeline_options import PdfPipelineOptions
-    from docling.datamodel.base_models import InputFormat
+    from docling.datamodel.base_models import ConversionStatus, InputFormat
+    from docling.datamodel.settings import settings as docling_settings
 except ImportError:
     DocumentConverter = None
     PdfFormatOption = None
     PdfPipelineOptions = None
+    ConversionStatus = None
     InputFormat = None
+    docling_settings = None
+
+try:
+    from docling.datamodel.accelerator_options import AcceleratorDevice, AcceleratorOptions
+except ImportError:
+    try:
+        # Older docling releases
+        from docling.datamodel.pipeline_options import AcceleratorDevice, AcceleratorOptions
+    except ImportError:
+        AcceleratorDevice = None
+        AcceleratorOptions = None
 
 # Import the transformer logic
 from transformer import transform_to_nodes
-from schema_converter import convert_to_relational, save_relational_json
+from schema_converter import convert_to_relational, save_relational_json, write_json
+
+# Page elements sent through the layout/table models per batch
+ELEMENTS_BATCH_SIZE = 32
+
+# Opt-in: compile the Docling models with torch.compile and/or run them
+# under FP16 autocast (CUDA only)
+TORCH_COMPILE = os.environ.get("DOCLING_TORCH_COMPILE") == "1"
+FP16 = os.environ.get("DOCLING_FP16") == "1"
+
+# Threads saving conversion results while the next documents convert, and
+# the number of finished results allowed to wait for them (each one holds
+# a whole converted document in memory)
+POSTPROCESS_WORKERS = 4
+RESULT_QUEUE_SIZE = 2
 
 DEFAULT_INPUT_DIR = Path("data")
 DEFAULT_OUTPUT_DIR = Path("output")
-ALLOWED_EXTS = {
+ALLOWED_EXTS = frozenset({
     ".pdf", ".ppt", ".pptx", ".doc", ".docx", ".txt", ".md",
     ".html", ".htm", ".jpg", ".jpeg", ".png", ".tif", ".tiff"
-}
+})
 
 def create_argument_parser() -> argparse.ArgumentParser:
     """Creates and configures the argument parser for the script."""
@@ -67,6 +99,12 @@ def create_argument_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Process all files in input directories, regardless of extension."
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: 1 with CUDA, else min(CPU count, 4))."
+    )
     return parser
 
 def load_config(config_path: str) -> dict:
@@ -77,6 +115,26 @@ def load_config(config_path: str) -> dict:
     with path.open("r", encoding="utf-8") as f:
         return json.load(f)
 
+def _is_allowed(name: str, force: bool) -> bool:
+    """Checks a file name's extension against ALLOWED_EXTS (always True with --force)."""
+    if force:
+        return True
+    dot = name.rfind(".")
+    return dot > 0 and name[dot:].lower() in ALLOWED_EXTS
+
+def _scan_dir(directory: Path, force: bool):
+    """Yields the allowed files in directory, filtering on os.scandir entry names."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and _is_allowed(entry.name, force):
+                yield Path(entry.path)
+
+def _expand_input(path: Path, force: bool):
+    """Yields the allowed files for a CLI input (a file or a directory)."""
+    if path.is_dir():
+        return _scan_dir(path, force)
+    return (path,) if _is_allowed(path.name, force) else ()
+
 def discover_input_files(
     cli_inputs: list[str],
     config: dict,
@@ -85,52 +143,75 @@ def discover_input_files(
     """
     Discovers input files from CLI arguments, config file, or the default data directory.
     """
-    paths_to_process = []
     if cli_inputs:
-        for path_str in cli_inputs:
-            path = Path(path_str).expanduser()
-            if path.is_dir():
-                paths_to_process.extend(
-                    p for p in path.iterdir()
-                    if force or p.suffix.lower() in ALLOWED_EXTS
-                )
-            elif force or path.suffix.lower() in ALLOWED_EXTS:
-                paths_to_process.append(path)
+        cli_paths = (Path(path_str).expanduser() for path_str in cli_inputs)
+        candidates = itertools.chain.from_iterable(
+            _expand_input(path, force) for path in cli_paths
+        )
+    elif config.get("input_files"):
+        candidates = (
+            path for path in map(Path, config["input_files"])
+            if _is_allowed(path.name, force)
+        )
+    elif DEFAULT_INPUT_DIR.exists():
+        candidates = _scan_dir(DEFAULT_INPUT_DIR, force)
     else:
-        config_files = config.get("input_files", [])
-        if config_files:
-            for file_str in config_files:
-                path = Path(file_str)
-                if force or path.suffix.lower() in ALLOWED_EXTS:
-                    paths_to_process.append(path)
-        elif DEFAULT_INPUT_DIR.exists():
-            paths_to_process.extend(
-                p for p in DEFAULT_INPUT_DIR.iterdir()
-                if force or p.suffix.lower() in ALLOWED_EXTS
-            )
-    return sorted(list(set(paths_to_process)))
+        candidates = ()
 
-def print_diagnostics():
-    """Prints diagnostic information about the environment."""
+    # Ordered dedup, then sort on the plain strings (cheaper than Path.__lt__)
+    return sorted(dict.fromkeys(candidates), key=os.fspath)
+
+@lru_cache(maxsize=1)
+def _diagnostics() -> tuple:
+    """Collects (log level, message) diagnostic lines once per process."""
     try:
         import torch
-        logger.info(f"PyTorch Version: {torch.__version__}")
+    except ImportError:
+        return ((logging.ERROR, "PyTorch is not installed."),)
+
+    lines = [(logging.INFO, f"PyTorch Version: {torch.__version__}")]
+    try:
         if torch.cuda.is_available():
-            device_count = torch.cuda.device_count()
-            current_device = torch.cuda.current_device()
-            device_name = torch.cuda.get_device_name(current_device)
-            logger.info(f"CUDA Available: YES ({device_count} devices)")
-            logger.info(f"Current Device: {device_name}")
+            # get_device_name() defaults to the current device
+            lines.append((logging.INFO, f"CUDA Available: YES ({torch.cuda.device_count()} devices)"))
+            lines.append((logging.INFO, f"Current Device: {torch.cuda.get_device_name()}"))
         else:
-            logger.warning("CUDA Available: NO (Using CPU)")
-            logger.warning("To enable GPU, please install PyTorch with CUDA support.")
-    except ImportError:
-        logger.error("PyTorch is not installed.")
+            lines.append((logging.WARNING, "CUDA Available: NO (Using CPU)"))
+            lines.append((logging.WARNING, "To enable GPU, please install PyTorch with CUDA support."))
     except Exception as e:
-        logger.error(f"Error getting CUDA info: {e}")
+        lines.append((logging.ERROR, f"Error getting CUDA info: {e}"))
+    return tuple(lines)
+
+def print_diagnostics():
+    """Prints diagnostic information about the environment (skipped if DOCLING_QUIET is set)."""
+    if os.environ.get("DOCLING_QUIET"):
+        return
+    for level, message in _diagnostics():
+        logger.log(level, message)
 
-def initialize_converter() -> Optional["DocumentConverter"]:
-    """Initializes and returns the DocumentConverter."""
+def cuda_available() -> bool:
+    """Returns True if PyTorch can see a CUDA device."""
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except Exception:
+        return False
+
+def default_worker_count() -> int:
+    """Picks the number of worker processes when --workers is not given."""
+    # A single process keeps the GPU busy; several would compete for its memory
+    if cuda_available():
+        return 1
+    return min(os.cpu_count() or 1, 4)
+
+def initialize_converter(workers: int = 1) -> Optional["DocumentConverter"]:
+    """
+    Initializes and returns the DocumentConverter.
+
+    Args:
+        workers: Number of processes running a converter at the same time;
+            the CPU cores are split between them.
+    """
     if DocumentConverter is None:
         logger.error("`docling` library not found. Please install it to run the digitizer.")
         return None
@@ -139,9 +220,19 @@ def initialize_converter() -> Optional["DocumentConverter"]:
         pipeline_options = PdfPipelineOptions()
         pipeline_options.generate_picture_images = True
         
-        # Docling automatically detects the best available device (CUDA/MPS/CPU).
-        # We rely on its internal logic, which checks torch.cuda.is_available().
-        return DocumentConverter(
+        # Let Docling pick the best device (CUDA/MPS/CPU) and use this
+        # process's share of the cores (all of them for a single process)
+        if AcceleratorOptions is not None:
+            pipeline_options.accelerator_options = AcceleratorOptions(
+                num_threads=max(1, (os.cpu_count() or 1) // workers),
+                device=AcceleratorDevice.AUTO
+            )
+        
+        # Larger batches keep the layout/table models (and the GPU) busy
+        if docling_settings is not None:
+            docling_settings.perf.elements_batch_size = ELEMENTS_BATCH_SIZE
+        
+        converter = DocumentConverter(
             format_options={
                 InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
             }
@@ -150,6 +241,53 @@ def initialize_converter() -> Optional["DocumentConverter"]:
         logger.error(f"Failed to initialize DocumentConverter: {e}")
         return None
 
+    optimize_models(converter)
+    return converter
+
+def _iter_torch_modules(obj, depth: int = 2):
+    """Yields (owner, attribute name, module) for torch modules held by obj or its attributes."""
+    import torch
+
+    seen = set()
+    stack = [(obj, depth)]
+    while stack:
+        owner, remaining = stack.pop()
+        for name, value in list(getattr(owner, "__dict__", {}).items()):
+            if isinstance(value, torch.nn.Module):
+                yield owner, name, value
+            elif remaining and hasattr(value, "__dict__") and id(value) not in seen:
+                seen.add(id(value))
+                stack.append((value, remaining - 1))
+
+def optimize_models(converter: "DocumentConverter"):
+    """
+    Applies the opt-in CUDA optimizations to the PDF pipeline's torch models:
+    FP16 autocast around forward (DOCLING_FP16=1) and torch.compile
+    (DOCLING_TORCH_COMPILE=1).
+
+    Docling doesn't expose its models, so they are found by scanning the
+    pipeline stages; any failure leaves the models as they are.
+    """
+    if not (TORCH_COMPILE or FP16) or not cuda_available():
+        return
+    try:
+        import torch
+
+        # Build the PDF pipeline (and load its models) now instead of on first convert
+        converter.initialize_pipeline(InputFormat.PDF)
+        pipeline = converter._get_pipeline(InputFormat.PDF)
+        stages = [*getattr(pipeline, "build_pipe", ()), *getattr(pipeline, "enrichment_pipe", ())]
+        for stage in stages:
+            for owner, name, module in _iter_torch_modules(stage):
+                if FP16:
+                    module.forward = torch.autocast("cuda", dtype=torch.float16)(module.forward)
+                    logger.info(f"Enabled FP16 autocast for {type(stage).__name__}.{name}")
+                if TORCH_COMPILE:
+                    setattr(owner, name, torch.compile(module, mode="reduce-overhead", fullgraph=False))
+                    logger.info(f"Compiled {type(stage).__name__}.{name} with torch.compile")
+    except Exception as e:
+        logger.warning(f"Could not optimize Docling models: {e}")
+
 def process_file(
     file_path: Path,
     converter: DocumentConverter,
@@ -160,7 +298,21 @@ def process_file(
     try:
         # 1. Convert using Docling
         result = converter.convert(str(file_path))
-        
+    except Exception as e:
+        logger.error(f"Error processing {file_path.name}: {e}")
+        return
+    
+    save_result(result, file_path, output_dir, start_time)
+
+
+def save_result(
+    result,
+    file_path: Path,
+    output_dir: Path,
+    start_time: float
+):
+    """Transforms a Docling conversion result and saves the JSON outputs (steps 2-6)."""
+    try:
         # 2. Create document-specific output folder
         doc_name = file_path.stem
         doc_output_dir = output_dir / doc_name
@@ -172,24 +324,22 @@ def process_file(
         tables_dir.mkdir(parents=True, exist_ok=True)
         
         # 3. Transform to hierarchical JSON
+        #    (asset paths include the document folder)
         hierarchical_json = transform_to_nodes(
             result.document,
             str(images_dir),
-            str(tables_dir)
+            str(tables_dir),
+            path_prefix=doc_name
         )
         
-        # 4. Update asset paths to include document folder
-        _update_asset_paths(hierarchical_json, doc_name)
+        # 4. Convert to relational schema
+        relational_json = convert_to_relational(hierarchical_json)
         
         # 5. Save hierarchical JSON
         json_output_path = doc_output_dir / f"{doc_name}.json"
-        with json_output_path.open("w", encoding="utf-8") as f:
-            json.dump(hierarchical_json, f, indent=2, ensure_ascii=False)
+        write_json(hierarchical_json, json_output_path)
         
-        # 6. Convert to relational schema
-        relational_json = convert_to_relational(hierarchical_json)
-        
-        # 7. Save relational JSON
+        # 6. Save relational JSON
         relational_output_path = doc_output_dir / f"{doc_name}_relational.json"
         save_relational_json(relational_json, str(relational_output_path))
         
@@ -201,23 +351,39 @@ def process_file(
         logger.error(f"Error processing {file_path.name}: {e}")
 
 
-def _update_asset_paths(json_data: dict, doc_name: str):
-    """Update asset paths to include document folder."""
-    
-    def update_children(children):
-        for child in children:
-            if child.get("src"):
-                src = child["src"]
-                if not src.startswith(doc_name):
-                    child["src"] = f"{doc_name}/{src}"
-            
-            if "children" in child:
-                update_children(child["children"])
-    
-    if "children" in json_data:
-        update_children(json_data["children"])
-        # import traceback
-        # traceback.print_exc()
+# Per-process state for worker processes, set up once by _init_worker
+_worker_converter = None
+_worker_output_dir = None
+
+def _init_worker(output_dir: str, workers: int):
+    """Initializes one DocumentConverter per worker process."""
+    global _worker_converter, _worker_output_dir
+    _worker_converter = initialize_converter(workers)
+    _worker_output_dir = Path(output_dir)
+
+def _process_one(file_path: Path):
+    """Processes a file in a worker process using its converter."""
+    if _worker_converter is None:
+        logger.error(f"Skipping {file_path.name}: converter failed to initialize in worker.")
+        return
+    process_file(file_path, _worker_converter, _worker_output_dir)
+
+def _handle_result(result, file_path: Path, output_dir: Path, start_time: float):
+    """Saves a successful conversion result or logs why it failed."""
+    if result.status not in (ConversionStatus.SUCCESS, ConversionStatus.PARTIAL_SUCCESS):
+        errors = "; ".join(str(e.error_message) for e in result.errors) or result.status
+        logger.error(f"Error processing {file_path.name}: {errors}")
+        return
+    save_result(result, file_path, output_dir, start_time)
+
+def _consume_results(results: queue.Queue, output_dir: Path):
+    """Postprocesses queued conversion results until a None sentinel arrives."""
+    while True:
+        item = results.get()
+        if item is None:
+            return
+        result, file_path, start_time = item
+        _handle_result(result, file_path, output_dir, start_time)
 
 def main():
     """Main function to run the digitization process."""
@@ -233,19 +399,57 @@ def main():
 
     print_diagnostics()
 
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    workers = min(args.workers or default_worker_count(), len(input_files))
+    if workers > 1:
+        if DocumentConverter is None:
+            logger.error("`docling` library not found. Please install it to run the digitizer.")
+            return
+
+        logger.info(f"Starting processing of {len(input_files)} files with {workers} workers...")
+        # "spawn" gives every worker a clean interpreter (and CUDA context)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(output_dir), workers)
+        ) as executor:
+            results = executor.map(_process_one, input_files)
+            for _ in tqdm(results, total=len(input_files), desc="Processing Files", unit="file"):
+                pass
+        logger.info("All tasks completed.")
+        return
+
     logger.info("Initializing DocumentConverter...")
     converter = initialize_converter()
     if converter is None:
         return
 
-    output_dir = Path(args.output)
-    output_dir.mkdir(parents=True, exist_ok=True)
-
     logger.info(f"Starting processing of {len(input_files)} files...")
     
-    # Use tqdm for progress bar
-    for file_path in tqdm(input_files, desc="Processing Files", unit="file"):
-        process_file(file_path, converter, output_dir)
+    # convert_all streams results and lets Docling batch pages across
+    # documents; failures are reported per result. Each result carries its
+    # source path, so outputs are named correctly even if an input is
+    # skipped or results arrive out of order.
+    # Conversion runs here while consumer threads save finished results,
+    # so the JSON/IO tail overlaps with the next document's inference.
+    results = converter.convert_all([str(p) for p in input_files], raises_on_error=False)
+    pending = queue.Queue(maxsize=RESULT_QUEUE_SIZE)
+    with ThreadPoolExecutor(max_workers=POSTPROCESS_WORKERS) as pool:
+        consumers = [
+            pool.submit(_consume_results, pending, output_dir)
+            for _ in range(POSTPROCESS_WORKERS)
+        ]
+        try:
+            start_time = time.time()
+            for result in tqdm(results, total=len(input_files), desc="Processing Files", unit="file"):
+                pending.put((result, Path(result.input.file), start_time))
+                start_time = time.time()
+        finally:
+            for _ in consumers:
+                pending.put(None)
         
     logger.info("All tasks completed.")
 
@@ -1,20 +1,79 @@
 """Document processing service (resolver)."""
 
+import asyncio
+import hashlib
 import os
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 
 from src.database.models import Document
 from src.database.repository import DocumentRepository
 from src.utilities.docling_processor import DoclingProcessor
-from src.utilities.file_handler import save_uploaded_file, cleanup_file
-from src.ai.gemini_client import get_gemini_client
+from src.utilities.file_handler import cleanup_file
+from src.ai.gemini_client import IMAGE_BATCH_SIZE, get_gemini_client
 
 logger = logging.getLogger(__name__)
 
 
+# Root that table/image src paths are relative to
+OUTPUT_ROOT = Path("output")
+
+_AI_TARGET_TYPES = frozenset(("table", "image"))
+
+
+def _iter_ai_targets(children, output_root: Path = OUTPUT_ROOT):
+    """
+    Yield (node, kind, path) for every table and image node in the tree.
+    
+    kind is "table" or "image"; path points at the CSV/image file under
+    output_root (src already includes the document folder).
+    """
+    stack = [iter(children)]
+    push, pop = stack.append, stack.pop
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            pop()
+            continue
+        
+        get = child.get
+        child_type = get("type")
+        if child_type in _AI_TARGET_TYPES:
+            src = get("src")
+            if src:
+                yield child, child_type, output_root / src
+        
+        # Walk nested children
+        nested = get("children")
+        if nested:
+            push(iter(nested))
+
+
+def _group_ai_targets(children) -> Dict[Tuple[str, bytes, Optional[str]], Tuple[Path, List[Dict[str, Any]]]]:
+    """
+    Group table and image nodes whose files have identical content.
+    
+    Returns:
+        Mapping of (kind, content hash, caption) to (path, nodes), so each
+        distinct table/image is sent to Gemini once. Nodes whose file
+        can't be read are skipped.
+    """
+    groups = {}
+    for child, kind, path in _iter_ai_targets(children):
+        try:
+            digest = hashlib.blake2b(path.read_bytes(), digest_size=16).digest()
+        except OSError:
+            continue
+        key = (kind, digest, child.get("caption"))
+        if key in groups:
+            groups[key][1].append(child)
+        else:
+            groups[key] = (path, [child])
+    return groups
+
+
 class DocumentResolver:
     """Service for document processing operations."""
     
@@ -24,29 +83,19 @@ class DocumentResolver:
         self.processor = DoclingProcessor()
         self.ai_client = get_gemini_client()
     
-    async def process_uploaded_document(
-        self,
-        file_content: bytes,
-        filename: str,
-        upload_dir: Path
-    ) -> Dict[str, Any]:
+    async def process_uploaded_document(self, file_path: Path) -> Dict[str, Any]:
         """
         Process an uploaded document file.
         
+        The file is deleted once processing finishes.
+        
         Args:
-            file_content: File content bytes
-            filename: Original filename
-            upload_dir: Directory to save uploaded file
+            file_path: Path the upload was saved to
             
         Returns:
             Processing status dict
         """
-        file_path = None
         try:
-            # Save uploaded file
-            file_path = await save_uploaded_file(file_content, filename, upload_dir)
-            logger.info(f"File saved to {file_path}")
-            
             # Process document with Docling
             hierarchical_json = self.processor.process_document(file_path)
             
@@ -75,70 +124,73 @@ class DocumentResolver:
             }
         finally:
             # Cleanup uploaded file
-            if file_path:
-                cleanup_file(file_path)
+            cleanup_file(file_path)
     
     async def _add_ai_summaries(self, json_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Add AI-generated summaries to content blocks."""
+        """
+        Add AI-generated summaries to content blocks.
         
-        def process_children(children):
-            """Recursively process children and add AI summaries."""
-            for child in children:
-                child_type = child.get("type")
-                
-                # Process tables
-                if child_type == "table" and child.get("src"):
-                    try:
-                        # Read CSV file (src already includes document folder)
-                        csv_path = Path("output") / child["src"]
-                        if csv_path.exists():
-                            csv_data = csv_path.read_text(encoding="utf-8")
-                            summary = self.ai_client.summarize_table(
-                                csv_data,
-                                caption=child.get("caption")
-                            )
-                            if summary:
-                                if "metadata" not in child:
-                                    child["metadata"] = {}
-                                child["metadata"]["ai_summary"] = summary
-                    except Exception as e:
-                        logger.error(f"Failed to summarize table: {e}")
-                
-                # Process images
-                elif child_type == "image" and child.get("src"):
-                    try:
-                        # Image path (src already includes document folder)
-                        image_path = Path("output") / child["src"]
-                        if image_path.exists():
-                            description = self.ai_client.describe_image(
-                                str(image_path),
-                                caption=child.get("caption")
-                            )
-                            if description:
-                                if "metadata" not in child:
-                                    child["metadata"] = {}
-                                child["metadata"]["ai_description"] = description
-                    except Exception as e:
-                        logger.error(f"Failed to describe image: {e}")
-                
-                # Recursively process nested children
-                if "children" in child:
-                    process_children(child["children"])
+        All table and image requests are collected first and then awaited
+        together, so Gemini latency overlaps instead of adding up per block.
+        Tables/images with identical content and caption share one request,
+        and images are described IMAGE_BATCH_SIZE per request.
+        """
+        groups = await asyncio.to_thread(_group_ai_targets, json_data.get("children", []))
+        tasks = []
+        images = []
+        for (kind, _, _), (path, nodes) in groups.items():
+            if kind == "table":
+                tasks.append(self._summarize_table(nodes, path))
+            else:
+                images.append((path, nodes))
+        tasks.extend(
+            self._describe_images(images[start:start + IMAGE_BATCH_SIZE])
+            for start in range(0, len(images), IMAGE_BATCH_SIZE)
+        )
         
-        # Process all children
-        if "children" in json_data:
-            process_children(json_data["children"])
+        if tasks:
+            # Gemini concurrency is capped by the client's semaphore
+            await asyncio.gather(*tasks, return_exceptions=True)
         
         return json_data
     
+    async def _summarize_table(self, nodes: List[Dict[str, Any]], csv_path: Path):
+        """Summarize a table once and store the summary on all its nodes."""
+        try:
+            csv_data = await asyncio.to_thread(csv_path.read_text, encoding="utf-8")
+            summary = await self.ai_client.summarize_table_async(
+                csv_data,
+                caption=nodes[0].get("caption")
+            )
+            if summary:
+                for child in nodes:
+                    child.setdefault("metadata", {})["ai_summary"] = summary
+        except Exception as e:
+            logger.error(f"Failed to summarize table: {e}")
+    
+    async def _describe_images(self, images: List[Tuple[Path, List[Dict[str, Any]]]]):
+        """Describe a batch of images in one request and store each description on its nodes."""
+        try:
+            descriptions = await self.ai_client.describe_images_batch_async(
+                [(str(image_path), nodes[0].get("caption")) for image_path, nodes in images]
+            )
+            for (_, nodes), description in zip(images, descriptions):
+                if description:
+                    for child in nodes:
+                        child.setdefault("metadata", {})["ai_description"] = description
+        except Exception as e:
+            logger.error(f"Failed to describe images: {e}")
+    
     def get_document_by_id(self, document_id: str) -> Optional[Document]:
         """Get document by ID."""
         return self.repo.get_by_id(document_id)
     
     def list_documents(self, skip: int = 0, limit: int = 100):
         """List documents with pagination."""
-        documents = self.repo.list_all(skip=skip, limit=limit)
-        total = self.repo.count()
+        # Responses include each document's sections and content blocks
+        documents = self.repo.list_all_with_sections(skip=skip, limit=limit)
+        # Pagination totals don't need to be exact on large tables
+        total = self.repo.count_approx()
         return {"documents": documents, "total": total}
     
     def delete_document(self, document_id: str) -> bool:
@@ -147,4 +199,4 @@ class DocumentResolver:
     
     def search_documents(self, query: str, skip: int = 0, limit: int = 100):
         """Search documents."""
-        return self.repo.search(query=query, skip=skip, limit=limit)
+        return list(self.repo.search(query=query, skip=skip, limit=limit))
@@ -22,7 +22,7 @@ class SearchResolver:
         limit: int = 100
     ) -> List[Document]:
         """Search documents by title or filename."""
-        return self.doc_repo.search(query=query, skip=skip, limit=limit)
+        return list(self.doc_repo.search(query=query, skip=skip, limit=limit))
     
     def search_content(
         self,
@@ -31,7 +31,7 @@ class SearchResolver:
         limit: int = 100
     ) -> List[ContentBlock]:
         """Full-text search in content blocks."""
-        return self.content_repo.search_text(query=query, skip=skip, limit=limit)
+        return list(self.content_repo.search_text(query=query, skip=skip, limit=limit))
     
     def get_tables(
         self,
@@ -1,32 +1,28 @@
 """Document management router."""
 
-import os
 from pathlib import Path
 from typing import Optional
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
 
+from src.config import get_env
 from src.database import get_db
 from .schemas import DocumentResponse, DocumentListResponse, ProcessingStatus
 from src.resolvers.document_resolver import DocumentResolver
-from src.utilities.file_handler import validate_file_extension, get_file_size_mb
+from src.utilities.file_handler import save_uploaded_file, validate_file_extension
 
 router = APIRouter()
 
 # Configuration
-UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "uploads"))
-MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", 100))
-ALLOWED_EXTENSIONS = {".pdf", ".docx", ".pptx", ".doc", ".ppt"}
+UPLOAD_DIR = Path(get_env("UPLOAD_DIR", "uploads"))
+MAX_FILE_SIZE_MB = int(get_env("MAX_FILE_SIZE_MB", 100))
+ALLOWED_EXTENSIONS = frozenset({".pdf", ".docx", ".pptx", ".doc", ".ppt"})
 
 
-async def process_document_background(
-    file_content: bytes,
-    filename: str,
-    db: Session
-):
+async def process_document_background(file_path: Path, db: Session):
     """Background task to process uploaded document."""
     resolver = DocumentResolver(db)
-    await resolver.process_uploaded_document(file_content, filename, UPLOAD_DIR)
+    await resolver.process_uploaded_document(file_path)
 
 
 @router.post("/upload", response_model=ProcessingStatus)
@@ -45,15 +41,18 @@ async def upload_document(
     if not validate_file_extension(file.filename, ALLOWED_EXTENSIONS):
         raise HTTPException(
             status_code=400,
-            detail=f"File type not supported. Allowed: {ALLOWED_EXTENSIONS}"
+            detail=f"File type not supported. Allowed: {', '.join(sorted(ALLOWED_EXTENSIONS))}"
         )
     
-    # Read file content
-    file_content = await file.read()
-    
-    # Validate file size
-    file_size_mb = len(file_content) / (1024 * 1024)
-    if file_size_mb > MAX_FILE_SIZE_MB:
+    # Stream file to disk, validating size as it is read
+    try:
+        file_path = await save_uploaded_file(
+            file,
+            file.filename,
+            UPLOAD_DIR,
+            max_size_bytes=MAX_FILE_SIZE_MB * 1024 * 1024
+        )
+    except ValueError:
         raise HTTPException(
             status_code=400,
             detail=f"File too large. Maximum size: {MAX_FILE_SIZE_MB}MB"
@@ -62,8 +61,7 @@ async def upload_document(
     # Add background task
     background_tasks.add_task(
         process_document_background,
-        file_content,
-        file.filename,
+        file_path,
         db
     )
     
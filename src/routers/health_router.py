@@ -1,6 +1,9 @@
 """Health check router."""
 
+import time
+
 from fastapi import APIRouter, Depends
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from src.database import get_db
@@ -8,6 +11,15 @@ from .schemas import HealthResponse
 
 router = APIRouter()
 
+# Connectivity probe, compiled once
+_PING = text("SELECT 1")
+
+# Seconds a database check result is reused by subsequent health checks
+PING_TTL_SECONDS = 0.1
+
+# (monotonic time of last check, database status)
+_last_ping = (float("-inf"), "connected")
+
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check(db: Session = Depends(get_db)):
@@ -15,13 +27,21 @@ async def health_check(db: Session = Depends(get_db)):
     Health check endpoint.
     
     Returns API status, database connectivity, and version.
+    The database is queried at most once per PING_TTL_SECONDS; probes in
+    between reuse the last result.
     """
-    # Test database connection
-    try:
-        db.execute("SELECT 1")
-        db_status = "connected"
-    except Exception as e:
-        db_status = f"error: {str(e)}"
+    global _last_ping
+
+    now = time.monotonic()
+    checked_at, db_status = _last_ping
+    if now - checked_at >= PING_TTL_SECONDS:
+        # Test database connection
+        try:
+            db.execute(_PING)
+            db_status = "connected"
+        except Exception as e:
+            db_status = f"error: {str(e)}"
+        _last_ping = (now, db_status)
     
     return HealthResponse(
         status="healthy",
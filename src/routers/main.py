@@ -1,19 +1,15 @@
 """FastAPI main application."""
 
-import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from dotenv import load_dotenv
 import logging
 
+from src.config import get_env
 from src.database import init_db
 from . import document_router, search_router, health_router
 
-# Load environment variables
-load_dotenv()
-
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -48,7 +44,7 @@ app = FastAPI(
 )
 
 # CORS configuration
-cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:8000").split(",")
+cors_origins = get_env("CORS_ORIGINS", "http://localhost:3000,http://localhost:8000").split(",")
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
@@ -89,9 +85,9 @@ async def root():
 if __name__ == "__main__":
     import uvicorn
     
-    host = os.getenv("API_HOST", "0.0.0.0")
-    port = int(os.getenv("API_PORT", 8000))
-    reload = os.getenv("API_RELOAD", "true").lower() == "true"
+    host = get_env("API_HOST", "0.0.0.0")
+    port = int(get_env("API_PORT", 8000))
+    reload = get_env("API_RELOAD", "true").lower() == "true"
     
     uvicorn.run(
         "src.routers.main:app",
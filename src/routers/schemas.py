@@ -15,6 +15,7 @@ class DocumentMetadata(BaseModel):
 class ContentBlockResponse(BaseModel):
     """Content block response schema."""
     id: str
+    document_id: str
     section_id: Optional[str]
     type: str
     text: Optional[str]
@@ -1,5 +1,81 @@
 import json
-from typing import Dict, Any, List, Optional
+import mmap
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Opt-in O_DIRECT output (DOCLING_DIRECT_IO=1, Linux only) for files of at
+# least DIRECT_IO_MIN_BYTES, so batch runs don't fill the page cache
+DIRECT_IO = (
+    os.environ.get("DOCLING_DIRECT_IO") == "1"
+    and sys.platform.startswith("linux")
+    and hasattr(os, "O_DIRECT")
+)
+DIRECT_IO_MIN_BYTES = 64 * 1024
+DIRECT_IO_ALIGNMENT = 4096
+
+
+def dump_json(data: Any) -> bytes:
+    """Serialize data to indented UTF-8 JSON bytes (orjson if available)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def write_json(data: Any, output_path: Union[str, Path]):
+    """
+    Writes data as indented JSON in a single write.
+
+    The file is written to ``{output_path}.tmp`` and then renamed over
+    output_path, so a crash mid-write never leaves a truncated file behind.
+    """
+    payload = dump_json(data)
+    tmp_path = Path(f"{output_path}.tmp")
+    try:
+        if not (DIRECT_IO and len(payload) >= DIRECT_IO_MIN_BYTES and _try_direct_write(tmp_path, payload)):
+            tmp_path.write_bytes(payload)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _try_direct_write(output_path: Path, payload: bytes) -> bool:
+    """Writes payload with _direct_write, returning False if the filesystem doesn't support O_DIRECT (e.g. tmpfs)."""
+    try:
+        _direct_write(output_path, payload)
+        return True
+    except OSError:
+        return False
+
+
+def _direct_write(output_path: Union[str, Path], payload: bytes):
+    """Writes payload with O_DIRECT from a page-aligned buffer, bypassing the page cache."""
+    size = len(payload)
+    aligned_size = -(-size // DIRECT_IO_ALIGNMENT) * DIRECT_IO_ALIGNMENT
+    # Anonymous mmaps are page aligned, as O_DIRECT requires
+    with mmap.mmap(-1, aligned_size) as buf:
+        buf.write(payload)
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT, 0o644)
+        try:
+            # Views are released even if a write fails (the exception's
+            # traceback may still reference them), so the mmap can be closed
+            with memoryview(buf) as view:
+                written = 0
+                while written < aligned_size:
+                    with view[written:] as chunk:
+                        written += os.write(fd, chunk)
+            # Drop the zero padding past the end of the payload
+            os.ftruncate(fd, size)
+        finally:
+            os.close(fd)
+
 
 def convert_to_relational(json_data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
     """
@@ -15,8 +91,8 @@ def convert_to_relational(json_data: Dict[str, Any]) -> Dict[str, List[Dict[str,
     # 1. Process Document
     doc_id = json_data.get("id")
     
-    # Add headers/footers to metadata
-    doc_metadata = json_data.get("metadata", {})
+    # Add headers/footers to metadata (copied so json_data is left as-is)
+    doc_metadata = dict(json_data.get("metadata", {}))
     doc_metadata["headers"] = json_data.get("page_headers", [])
     doc_metadata["footers"] = json_data.get("page_footers", [])
     
@@ -26,55 +102,59 @@ def convert_to_relational(json_data: Dict[str, Any]) -> Dict[str, List[Dict[str,
         "metadata": doc_metadata
     })
     
-    # Helper for recursive traversal
-    def traverse(node: Dict[str, Any], parent_section_id: Optional[str], current_section_id: Optional[str]):
-        nonlocal sections, content_blocks
-        
-        children = node.get("children", [])
-        
-        for i, child in enumerate(children):
-            child_type = child.get("type")
-            child_id = child.get("id")
-            
-            if child_type == "section":
-                # Create new section entry
-                sections.append({
-                    "id": child_id,
-                    "document_id": doc_id,
-                    "parent_id": parent_section_id, # Parent section (hierarchy)
-                    "title": child.get("title"),
-                    "order": i,
-                    "metadata": child.get("metadata", {})
-                })
-                
-                # Recurse with this section as the new parent
-                traverse(child, child_id, child_id)
-                
-            else:
-                # Content block (text, image, table, etc.)
-                # It belongs to the current_section_id (which might be None if at root)
-                content_blocks.append({
-                    "id": child_id,
-                    "document_id": doc_id,
-                    "section_id": current_section_id,
-                    "type": child_type,
-                    "text": child.get("text"),
-                    "src": child.get("src"),
-                    "caption": child.get("caption"),
-                    "metadata": child.get("metadata", {}),
-                    "order": i
-                })
-                
-                # Recurse (though content blocks usually don't have children in this model, 
-                # but our transformer might nest them if we change logic later. 
-                # Currently transformer puts children only in sections or root).
-                if "children" in child:
-                    traverse(child, parent_section_id, current_section_id)
-
-    # Start traversal from root
-    # Root is not a section, so parent_section_id is None, current_section_id is None
-    traverse(json_data, None, None)
-    
+    add_section = sections.append
+    add_content_block = content_blocks.append
+
+    # Iterative pre-order traversal; each stack entry holds the children
+    # iterator of a node plus the parent/current section ids for them.
+    # Root is not a section, so parent_section_id and current_section_id are None
+    stack = [(enumerate(json_data.get("children", [])), None, None)]
+    while stack:
+        children, parent_section_id, current_section_id = stack[-1]
+        entry = next(children, None)
+        if entry is None:
+            stack.pop()
+            continue
+
+        i, child = entry
+        child_type = child.get("type")
+        child_id = child.get("id")
+
+        if child_type == "section":
+            # Create new section entry
+            add_section({
+                "id": child_id,
+                "document_id": doc_id,
+                "parent_id": parent_section_id, # Parent section (hierarchy)
+                "title": child.get("title"),
+                "order": i,
+                "metadata": child.get("metadata", {})
+            })
+
+            # Descend with this section as the new parent
+            stack.append((enumerate(child.get("children", [])), child_id, child_id))
+
+        else:
+            # Content block (text, image, table, etc.)
+            # It belongs to the current_section_id (which might be None if at root)
+            add_content_block({
+                "id": child_id,
+                "document_id": doc_id,
+                "section_id": current_section_id,
+                "type": child_type,
+                "text": child.get("text"),
+                "src": child.get("src"),
+                "caption": child.get("caption"),
+                "metadata": child.get("metadata", {}),
+                "order": i
+            })
+
+            # Descend (though content blocks usually don't have children in this model,
+            # but our transformer might nest them if we change logic later.
+            # Currently transformer puts children only in sections or root).
+            if "children" in child:
+                stack.append((enumerate(child["children"]), parent_section_id, current_section_id))
+
     return {
         "documents": documents,
         "sections": sections,
@@ -83,5 +163,4 @@ def convert_to_relational(json_data: Dict[str, Any]) -> Dict[str, List[Dict[str,
 
 def save_relational_json(data: Dict[str, List[Dict[str, Any]]], output_path: str):
     """Saves the relational data to a JSON file."""
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    write_json(data, output_path)
@@ -1,10 +1,80 @@
+"""
+Transform a Docling document into the hierarchical node JSON.
+
+transform_to_nodes() calls docling_doc.export_to_dict() exactly once and
+works on that dict (plus docling_doc.pictures for image rendering), since
+serializing a real DoclingDocument is expensive for large documents.
+"""
+
 import uuid
 import json
 import os
 import csv
-from typing import List, Dict, Any
+import io
+import operator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+# zlib level for extracted PNG images: 1 encodes several times faster than
+# Pillow's default (6) for somewhat larger files; set PNG_COMPRESS_LEVEL=6-9
+# to trade speed for size
+PNG_COMPRESS_LEVEL = int(os.environ.get("PNG_COMPRESS_LEVEL", "1"))
+
+# Text of a table grid cell
+_cell_text = operator.itemgetter("text")
+
+# Threads saving a document's images and table CSVs (PNG encoding and file
+# writes release the GIL, so they run in parallel)
+IO_WORKERS = min(8, os.cpu_count() or 1)
+
+# Element kinds handled by transform_to_nodes; each element's label is
+# mapped to its kind with one dict lookup instead of a chain of compares
+_HEADER, _FOOTER, _SECTION, _TEXT, _PICTURE, _TABLE, _OTHER = range(7)
+_LABEL_KINDS = {
+    "page_header": _HEADER,
+    "page_footer": _FOOTER,
+    "section_header": _SECTION,
+    "text": _TEXT,
+    "code": _TEXT,
+    "caption": _TEXT,
+    "paragraph": _TEXT,
+    "list_item": _TEXT,
+    "picture": _PICTURE,
+    "table": _TABLE,
+}
+
+# Labels kept even when the element has no text
+_ASSET_LABELS = frozenset(("picture", "table", "image"))
+
+def _build_ref_index(doc_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Index every item of the exported document by its self_ref.
+
+    All top-level item lists (texts, tables, pictures, groups, ...) are
+    swept once, so "#/texts/0"-style references resolve without parsing
+    the JSON pointer.
+
+    Args:
+        doc_dict: The document as returned by export_to_dict().
 
-def transform_to_nodes(docling_doc, images_dir: str, tables_dir: str) -> Dict[str, Any]:
+    Returns:
+        Mapping of self_ref to item.
+    """
+    ref_index = {}
+    for value in doc_dict.values():
+        if isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict) and "self_ref" in item:
+                    ref_index[item["self_ref"]] = item
+    return ref_index
+
+def transform_to_nodes(
+    docling_doc,
+    images_dir: str,
+    tables_dir: str,
+    path_prefix: str = ""
+) -> Dict[str, Any]:
     """
     Transforms the docling document into a hierarchical node structure.
     
@@ -12,6 +82,8 @@ def transform_to_nodes(docling_doc, images_dir: str, tables_dir: str) -> Dict[st
         docling_doc: The Docling document object.
         images_dir: Directory to save extracted images.
         tables_dir: Directory to save extracted tables.
+        path_prefix: Folder prepended to image/table src paths, e.g. the
+            document name (images/abc.png -> doc_name/images/abc.png).
         
     Returns:
         A dictionary representing the root document node with nested children.
@@ -19,9 +91,21 @@ def transform_to_nodes(docling_doc, images_dir: str, tables_dir: str) -> Dict[st
     
     # Export to dict to access the structure and elements easily
     doc_dict = docling_doc.export_to_dict()
+
+    # Asset paths are written in their final form when nodes are created
+    images_src = f"{path_prefix}/images/" if path_prefix else "images/"
+    tables_src = f"{path_prefix}/tables/" if path_prefix else "tables/"
     
+    # Resolving a reference is a single dict lookup
+    ref_index = _build_ref_index(doc_dict)
+
     # Helper to resolve references in the JSON structure
     def resolve_ref(ref: str) -> Any:
+        obj = ref_index.get(ref)
+        if obj is not None:
+            return obj
+
+        # Not an indexed item: walk the JSON pointer (memoized)
         parts = ref.strip('#/').split('/')
         obj = doc_dict
         for part in parts:
@@ -29,6 +113,7 @@ def transform_to_nodes(docling_doc, images_dir: str, tables_dir: str) -> Dict[st
                 obj = obj[int(part)]
             else:
                 obj = obj.get(part)
+        ref_index[ref] = obj
         return obj
 
     # Create the root document node
@@ -48,6 +133,10 @@ def transform_to_nodes(docling_doc, images_dir: str, tables_dir: str) -> Dict[st
     # Root is level 0
     stack = [(root_node, 0)]
 
+    # append() of the innermost open section's children, updated whenever
+    # the stack changes
+    current_append = root_node["children"].append
+
     # Get the body elements
     body_ref = doc_dict.get("body", {})
     if not body_ref:
@@ -57,9 +146,19 @@ def transform_to_nodes(docling_doc, images_dir: str, tables_dir: str) -> Dict[st
     # Docling's body.children is a list of refs
     child_refs = body_ref.get("children", [])
     
-    # Sets to collect unique headers and footers
-    headers = set()
-    footers = set()
+    # Pictures by self_ref, matched against picture elements below
+    pic_by_ref = {pic.self_ref: pic for pic in getattr(docling_doc, "pictures", ())}
+
+    # Image/CSV writes, collected during the walk and run in parallel after it
+    image_tasks = []
+    table_tasks = []
+
+    # CSV file of each table node, by node id (used when merging tables)
+    csv_paths = {}
+
+    # Unique headers and footers, in first-seen order (dicts as ordered sets)
+    headers = {}
+    footers = {}
 
     for i, child_ref in enumerate(child_refs):
         element = resolve_ref(child_ref.get("$ref"))
@@ -67,21 +166,22 @@ def transform_to_nodes(docling_doc, images_dir: str, tables_dir: str) -> Dict[st
             continue
 
         element_type = element.get("label")
+        kind = _LABEL_KINDS.get(element_type, _OTHER)
         text_content = element.get("text", "").strip()
         
         # Skip empty text elements unless they are specific types
-        if not text_content and element_type not in ["picture", "table", "image"]:
+        if not text_content and element_type not in _ASSET_LABELS:
             continue
 
         # --- Handle Headers and Footers ---
-        if element_type == "page_header":
+        if kind == _HEADER:
             if text_content:
-                headers.add(text_content)
+                headers[text_content] = None
             continue # Skip adding to children
             
-        if element_type == "page_footer":
+        if kind == _FOOTER:
             if text_content:
-                footers.add(text_content)
+                footers[text_content] = None
             continue # Skip adding to children
 
         node_id = str(uuid.uuid4())
@@ -96,7 +196,7 @@ def transform_to_nodes(docling_doc, images_dir: str, tables_dir: str) -> Dict[st
             new_node["metadata"]["page_no"] = element["prov"][0].get("page_no")
 
         # --- Handle Section Headers (Hierarchy) ---
-        if element_type == "section_header":
+        if kind == _SECTION:
             new_node["type"] = "section"
             new_node["title"] = text_content
             new_node["children"] = []
@@ -115,36 +215,27 @@ def transform_to_nodes(docling_doc, images_dir: str, tables_dir: str) -> Dict[st
             
             # Push this new section to stack
             stack.append((new_node, level))
+            current_append = new_node["children"].append
 
         # --- Handle Text/Code/Captions ---
-        elif element_type in ["text", "code", "caption", "paragraph", "list_item"]:
+        elif kind == _TEXT:
             new_node["text"] = text_content
             # Add to current parent (do not push to stack)
-            stack[-1][0]["children"].append(new_node)
+            current_append(new_node)
 
         # --- Handle Images ---
-        elif element_type == "picture":
+        elif kind == _PICTURE:
             new_node["type"] = "image"
             
-            # Try to find and save the image
-            saved_image = False
-            if hasattr(docling_doc, "pictures"):
-                for pic in docling_doc.pictures:
-                    # We compare self_ref
-                    if pic.self_ref == element.get("self_ref"):
-                        try:
-                            image = pic.get_image(doc=docling_doc)
-                            if image:
-                                image_filename = f"{node_id}.png"
-                                image_path = os.path.join(images_dir, image_filename)
-                                image.save(image_path)
-                                new_node["src"] = os.path.join("images", image_filename).replace("\\", "/")
-                                saved_image = True
-                        except Exception as e:
-                            print(f"ERROR: Could not process image {node_id}: {e}")
-                        break
-            
-            if not saved_image:
+            # Find the image; it is saved after the walk (src is removed
+            # again if saving fails)
+            pic = pic_by_ref.get(element.get("self_ref"))
+            if pic is not None:
+                image_filename = f"{node_id}.png"
+                image_path = os.path.join(images_dir, image_filename)
+                new_node["src"] = images_src + image_filename
+                image_tasks.append((new_node, pic, image_path))
+            else:
                 print(f"WARNING: Image {node_id} was not saved (no matching picture found)")
             
             # Handle captions for images
@@ -152,10 +243,10 @@ def transform_to_nodes(docling_doc, images_dir: str, tables_dir: str) -> Dict[st
             if captions:
                 new_node["caption"] = " ".join(captions)
                 
-            stack[-1][0]["children"].append(new_node)
+            current_append(new_node)
 
         # --- Handle Tables ---
-        elif element_type == "table":
+        elif kind == _TABLE:
             new_node["type"] = "table"
             
             # Handle captions for tables
@@ -172,102 +263,175 @@ def transform_to_nodes(docling_doc, images_dir: str, tables_dir: str) -> Dict[st
                     # For simplicity, we take the grid as is.
                     # Grid is list of lists of cells. Cell has 'text'.
                     
-                    table_data = [[cell["text"] for cell in row] for row in grid]
+                    table_data = [list(map(_cell_text, row)) for row in grid]
                     
                     if table_data:
                         new_node["columns"] = table_data[0]
                         new_node["rows"] = table_data[1:]
                         
-                        # Save as CSV
+                        # Save as CSV (after the walk)
                         table_filename = f"{node_id}.csv"
                         table_path = os.path.join(tables_dir, table_filename)
-                        with open(table_path, "w", newline="", encoding="utf-8") as f:
-                            writer = csv.writer(f)
-                            writer.writerows(table_data)
+                        table_tasks.append((table_path, table_data))
+                        csv_paths[node_id] = table_path
                         
-                        new_node["src"] = os.path.join("tables", table_filename).replace("\\", "/")
+                        new_node["src"] = tables_src + table_filename
 
-            stack[-1][0]["children"].append(new_node)
+            current_append(new_node)
             
         # --- Handle Other Types ---
         else:
             # Generic fallback
             new_node["text"] = text_content
-            stack[-1][0]["children"].append(new_node)
+            current_append(new_node)
 
     # Add collected headers and footers to root node
-    root_node["page_headers"] = list(headers)
-    root_node["page_footers"] = list(footers)
+    # (immutable tuples in first-seen order; serialized as JSON arrays)
+    root_node["page_headers"] = tuple(headers)
+    root_node["page_footers"] = tuple(footers)
+
+    # Write images and table CSVs (which merging below appends to)
+    save_assets(docling_doc, image_tasks, table_tasks)
 
     # --- Post-processing: Merge split tables ---
-    merge_tables(root_node, tables_dir)
+    merge_tables(root_node, tables_dir, csv_paths)
 
     return root_node
 
-def merge_tables(node: Dict[str, Any], tables_dir: str):
+def _save_picture(docling_doc, pic, image_path: str) -> bool:
+    """Renders a picture item and saves it as PNG. Returns False if it has no image."""
+    image = pic.get_image(doc=docling_doc)
+    if not image:
+        return False
+    image.save(image_path, format="PNG", compress_level=PNG_COMPRESS_LEVEL, optimize=False)
+    return True
+
+def _csv_text(rows: List[List[str]]) -> str:
+    """Formats rows as CSV text in memory."""
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    return buf.getvalue()
+
+def _save_table_csv(table_path: str, table_data: List[List[str]]):
+    """Writes a table grid to a CSV file with a single write."""
+    with open(table_path, "w", newline="", encoding="utf-8") as f:
+        f.write(_csv_text(table_data))
+
+def save_assets(docling_doc, image_tasks: list, table_tasks: list):
     """
-    Recursively merges split tables in the node tree.
+    Saves images and table CSVs in parallel on IO_WORKERS threads.
+
+    Args:
+        docling_doc: The Docling document the pictures belong to.
+        image_tasks: (node, picture, image_path) tuples; src is removed from
+            nodes whose image could not be saved.
+        table_tasks: (table_path, table_data) tuples.
+    """
+    if not image_tasks and not table_tasks:
+        return
+
+    workers = min(IO_WORKERS, len(image_tasks) + len(table_tasks))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        image_futures = [
+            (node, pool.submit(_save_picture, docling_doc, pic, image_path))
+            for node, pic, image_path in image_tasks
+        ]
+        table_futures = [
+            pool.submit(_save_table_csv, table_path, table_data)
+            for table_path, table_data in table_tasks
+        ]
+
+        for node, future in image_futures:
+            try:
+                saved_image = future.result()
+            except Exception as e:
+                node.pop("src", None)
+                print(f"ERROR: Could not process image {node['id']}: {e}")
+                continue
+            if not saved_image:
+                node.pop("src", None)
+                print(f"WARNING: Image {node['id']} was not saved (no matching picture found)")
+
+        # Propagate CSV write errors, as the inline writes did
+        for future in table_futures:
+            future.result()
+
+def merge_tables(node: Dict[str, Any], tables_dir: str, csv_paths: Optional[Dict[str, str]] = None):
+    """
+    Merges split tables in the node tree.
     Tables are considered split if they are adjacent (ignoring page headers/footers)
     and have identical columns.
+
+    csv_paths maps table node ids to their CSV files; tables not in it are
+    looked up in tables_dir by the file name in their src.
     """
-    if "children" not in node:
-        return
+    if csv_paths is None:
+        csv_paths = {}
 
-    children = node["children"]
-    if not children:
-        return
+    def csv_path_of(table_node: Dict[str, Any]) -> str:
+        path = csv_paths.get(table_node.get("id"))
+        if path is None:
+            path = os.path.join(tables_dir, os.path.basename(table_node["src"]))
+        return path
 
-    # We will rebuild the children list
-    new_children = []
-    last_table_node = None
-    
-    for child in children:
-        # Recursively process children first
-        merge_tables(child, tables_dir)
-        
-        is_merged = False
+    # Each node's children are merged independently, so the tree can be
+    # walked in any order; an explicit stack avoids deep recursion
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        children = node.get("children")
+        if not children:
+            continue
+
+        # We will rebuild the children list (kept only if something merged)
+        new_children = []
+        last_table_node = None
+        merged_any = False
         
-        if child["type"] == "table" and "columns" in child:
-            if last_table_node:
-                # Check if we can merge with the last table
-                # We need to ensure that we haven't encountered any "content" nodes since the last table.
-                # Since we removed headers/footers from children, adjacent tables should be truly adjacent now.
-                
-                # Check columns match
-                if child.get("columns") == last_table_node.get("columns"):
-                    # Merge!
-                    # 1. Append rows
-                    last_table_node["rows"].extend(child["rows"])
+        for child in children:
+            is_merged = False
+            
+            if child["type"] == "table" and "columns" in child:
+                if last_table_node:
+                    # Check if we can merge with the last table
+                    # We need to ensure that we haven't encountered any "content" nodes since the last table.
+                    # Since we removed headers/footers from children, adjacent tables should be truly adjacent now.
                     
-                    # 2. Update CSV
-                    try:
-                        # Read existing CSV of last_table
-                        last_csv_path = os.path.join(tables_dir, os.path.basename(last_table_node["src"]))
+                    # Check columns match
+                    if child.get("columns") == last_table_node.get("columns"):
+                        # Merge!
+                        # 1. Append rows
+                        last_table_node["rows"].extend(child["rows"])
                         
-                        # Append new rows to CSV
-                        with open(last_csv_path, "a", newline="", encoding="utf-8") as f:
-                            writer = csv.writer(f)
-                            writer.writerows(child["rows"])
+                        # 2. Update CSV
+                        try:
+                            # Read existing CSV of last_table
+                            last_csv_path = csv_path_of(last_table_node)
                             
-                        # Delete the second table's CSV
-                        child_csv_path = os.path.join(tables_dir, os.path.basename(child["src"]))
-                        if os.path.exists(child_csv_path):
-                            os.remove(child_csv_path)
+                            # Append new rows to CSV
+                            with open(last_csv_path, "a", newline="", encoding="utf-8") as f:
+                                f.write(_csv_text(child["rows"]))
+                                
+                            # Delete the second table's CSV
+                            child_csv_path = csv_path_of(child)
+                            Path(child_csv_path).unlink(missing_ok=True)
+                                
+                            is_merged = True
+                            merged_any = True
                             
-                        is_merged = True
-                        
-                    except Exception as e:
-                        print(f"Error merging tables: {e}")
-            
-            if not is_merged:
-                last_table_node = child
+                        except Exception as e:
+                            print(f"Error merging tables: {e}")
+                
+                if not is_merged:
+                    last_table_node = child
+                    new_children.append(child)
+                
+            else:
+                # Other content (text, section, image, etc.) -> breaks the merge chain
+                last_table_node = None
                 new_children.append(child)
-            
-        else:
-            # Other content (text, section, image, etc.) -> breaks the merge chain
-            last_table_node = None
-            new_children.append(child)
-            
-    node["children"] = new_children
-
-
+                
+        if merged_any:
+            node["children"] = new_children
+            children = new_children
+        stack.extend(children)
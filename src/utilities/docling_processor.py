@@ -1,6 +1,5 @@
 """Docling document processor utility."""
 
-import os
 from pathlib import Path
 from typing import Dict, Any
 import logging
@@ -9,12 +8,13 @@ from docling.document_converter import DocumentConverter, PdfFormatOption
 from docling.datamodel.pipeline_options import PdfPipelineOptions
 from docling.datamodel.base_models import InputFormat
 
+from src.config import get_env
 from src.transformer import transform_to_nodes
 
 logger = logging.getLogger(__name__)
 
 # Base output directory
-OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "output"))
+OUTPUT_DIR = Path(get_env("OUTPUT_DIR", "output"))
 
 
 class DoclingProcessor:
@@ -71,40 +71,18 @@ class DoclingProcessor:
             # Convert document
             result = self.converter.convert(str(file_path))
             
-            # Transform to hierarchical JSON
+            # Transform to hierarchical JSON, with asset paths relative to
+            # the output root (document_name/images/file.png)
             hierarchical_json = transform_to_nodes(
                 result.document,
                 str(images_dir),
-                str(tables_dir)
+                str(tables_dir),
+                path_prefix=doc_name
             )
             
-            # Update paths in JSON to be relative to output root
-            # (images/file.png -> document_name/images/file.png)
-            self._update_asset_paths(hierarchical_json, doc_name)
-            
             logger.info(f"Document processed successfully: {hierarchical_json.get('id')}")
             return hierarchical_json
             
         except Exception as e:
             logger.error(f"Error processing document {file_path}: {e}")
             raise
-    
-    def _update_asset_paths(self, json_data: Dict[str, Any], doc_name: str):
-        """Update asset paths to include document folder."""
-        
-        def update_children(children):
-            for child in children:
-                # Update image/table src paths
-                if child.get("src"):
-                    # Convert: images/abc.png -> doc_name/images/abc.png
-                    src = child["src"]
-                    if not src.startswith(doc_name):
-                        child["src"] = f"{doc_name}/{src}"
-                
-                # Recursively process nested children
-                if "children" in child:
-                    update_children(child["children"])
-        
-        if "children" in json_data:
-            update_children(json_data["children"])
-
@@ -2,42 +2,83 @@
 
 import os
 import shutil
+import tempfile
 from pathlib import Path
-from typing import BinaryIO
+from typing import AbstractSet, AsyncIterator, BinaryIO, Optional
 import logging
 
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
 logger = logging.getLogger(__name__)
 
+# Bytes read from the upload per iteration
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 
 async def save_uploaded_file(
-    file_content: bytes,
+    upload,
     filename: str,
-    upload_dir: Path
+    upload_dir: Path,
+    max_size_bytes: Optional[int] = None
 ) -> Path:
     """
-    Save uploaded file to disk.
+    Stream an uploaded file to disk.
+    
+    The upload is copied in UPLOAD_CHUNK_SIZE chunks to a temporary file
+    in upload_dir, which is renamed to filename once complete, so memory
+    use does not grow with the upload size. Chunks are written through
+    aiofiles when it is installed, so disk writes do not block the event
+    loop.
     
     Args:
-        file_content: File content bytes
+        upload: Upload to read from (anything with ``async read(size)``,
+            e.g. FastAPI's UploadFile)
         filename: Original filename
         upload_dir: Directory to save file
+        max_size_bytes: Reject uploads larger than this (None for no limit)
         
     Returns:
         Path to saved file
+        
+    Raises:
+        ValueError: If the upload exceeds max_size_bytes
     """
     upload_dir.mkdir(parents=True, exist_ok=True)
     file_path = upload_dir / filename
     
+    fd, tmp_name = tempfile.mkstemp(dir=upload_dir, suffix=Path(filename).suffix)
+    os.close(fd)
     try:
-        with file_path.open("wb") as f:
-            f.write(file_content)
+        if aiofiles is not None:
+            async with aiofiles.open(tmp_name, "wb") as f:
+                async for chunk in _read_chunks(upload, max_size_bytes):
+                    await f.write(chunk)
+        else:
+            with open(tmp_name, "wb") as f:
+                async for chunk in _read_chunks(upload, max_size_bytes):
+                    f.write(chunk)
+        os.replace(tmp_name, file_path)
         logger.info(f"File saved: {file_path}")
         return file_path
     except Exception as e:
+        Path(tmp_name).unlink(missing_ok=True)
         logger.error(f"Failed to save file {filename}: {e}")
         raise
 
 
+async def _read_chunks(upload, max_size_bytes: Optional[int]) -> AsyncIterator[bytes]:
+    """Yield the upload in UPLOAD_CHUNK_SIZE chunks, enforcing the size limit."""
+    size = 0
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if max_size_bytes is not None and size > max_size_bytes:
+            raise ValueError(f"File exceeds {max_size_bytes} bytes")
+        yield chunk
+
+
 def cleanup_file(file_path: Path) -> None:
     """
     Delete a file from disk.
@@ -53,7 +94,7 @@ def cleanup_file(file_path: Path) -> None:
         logger.error(f"Failed to delete file {file_path}: {e}")
 
 
-def validate_file_extension(filename: str, allowed_extensions: set) -> bool:
+def validate_file_extension(filename: str, allowed_extensions: AbstractSet[str]) -> bool:
     """
     Validate file extension.
     
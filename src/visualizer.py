@@ -1,145 +1,23 @@
 import json
 import argparse
 import os
+from html import escape
 from pathlib import Path
 
-def json_to_html(node, level=0):
-    """Recursively converts a JSON node to an HTML string."""
-    
-    node_type = node.get("type", "unknown")
-    text = node.get("text", "")
-    title = node.get("title", "")
-    src = node.get("src", "")
-    caption = node.get("caption", "")
-    children = node.get("children", [])
-    
-    indent = "  " * level
-    html = f'{indent}<div class="node node-{node_type}">\n'
-    
-    # Header for the node
-    html += f'{indent}  <div class="node-header">\n'
-    html += f'{indent}    <span class="badge">{node_type}</span>\n'
-    
-    if title:
-        html += f'{indent}    <span class="title">{title}</span>\n'
-    if text:
-        # Truncate long text for preview
-        preview = text[:100] + "..." if len(text) > 100 else text
-        html += f'{indent}    <span class="text-preview">{preview}</span>\n'
-        
-    html += f'{indent}  </div>\n'
-    
-    # Content details
-    html += f'{indent}  <div class="node-content">\n'
-    if text and len(text) > 100:
-        html += f'{indent}    <p class="full-text">{text}</p>\n'
-        
-    if src:
-        if node_type == "image":
-            html += f'{indent}    <img src="{src}" alt="Extracted Image" style="max-width: 300px;">\n'
-        elif node_type == "table":
-            html += f'{indent}    <p><a href="{src}" target="_blank">View Table CSV</a></p>\n'
-            
-    if caption:
-        html += f'{indent}    <p class="caption">Caption: {caption}</p>\n'
-        
-    html += f'{indent}  </div>\n'
-    
-    # Children
-    if children:
-        html += f'{indent}  <div class="children">\n'
-        for child in children:
-            html += json_to_html(child, level + 1)
-        html += f'{indent}  </div>\n'
-        
-    html += f'{indent}</div>\n'
-    
-    return html
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def relational_to_html_tables(relational_data):
-    """Converts relational JSON to HTML tables."""
-    
-    html = ""
-    
-    # Documents Table
-    if "documents" in relational_data:
-        html += '<h2>Documents</h2>\n'
-        html += '<table class="relational-table">\n'
-        html += '<thead><tr><th>ID</th><th>Title</th><th>Metadata</th></tr></thead>\n<tbody>\n'
-        for doc in relational_data["documents"]:
-            metadata_str = json.dumps(doc.get("metadata", {}), indent=2)
-            html += f'<tr><td>{doc.get("id", "")[:8]}...</td><td>{doc.get("title", "")}</td><td><pre>{metadata_str}</pre></td></tr>\n'
-        html += '</tbody></table>\n'
-    
-    # Sections Table
-    if "sections" in relational_data:
-        html += '<h2>Sections</h2>\n'
-        html += '<table class="relational-table">\n'
-        html += '<thead><tr><th>ID</th><th>Document ID</th><th>Parent ID</th><th>Title</th><th>Order</th></tr></thead>\n<tbody>\n'
-        for section in relational_data["sections"][:50]:  # Limit to first 50
-            parent_id = section.get("parent_id") or "None"
-            if parent_id != "None":
-                parent_id = parent_id[:8] + "..."
-            html += f'<tr><td>{section.get("id", "")[:8]}...</td><td>{section.get("document_id", "")[:8]}...</td><td>{parent_id}</td><td>{section.get("title", "")}</td><td>{section.get("order", "")}</td></tr>\n'
-        if len(relational_data["sections"]) > 50:
-            html += f'<tr><td colspan="5"><em>... and {len(relational_data["sections"]) - 50} more sections</em></td></tr>\n'
-        html += '</tbody></table>\n'
-    
-    # Content Blocks Table
-    if "content_blocks" in relational_data:
-        html += '<h2>Content Blocks</h2>\n'
-        html += '<table class="relational-table">\n'
-        html += '<thead><tr><th>ID</th><th>Section ID</th><th>Type</th><th>Text Preview</th><th>Order</th></tr></thead>\n<tbody>\n'
-        for block in relational_data["content_blocks"][:100]:  # Limit to first 100
-            text = block.get("text", "")
-            text_preview = text[:50] + "..." if text and len(text) > 50 else text or ""
-            section_id = block.get("section_id") or "None"
-            if section_id != "None":
-                section_id = section_id[:8] + "..."
-            html += f'<tr><td>{block.get("id", "")[:8]}...</td><td>{section_id}</td><td>{block.get("type", "")}</td><td>{text_preview}</td><td>{block.get("order", "")}</td></tr>\n'
-        if len(relational_data["content_blocks"]) > 100:
-            html += f'<tr><td colspan="5"><em>... and {len(relational_data["content_blocks"]) - 100} more content blocks</em></td></tr>\n'
-        html += '</tbody></table>\n'
-    
-    return html
-
-def generate_html_preview(json_path: str, output_path: str):
-    """Generates a standalone HTML file to visualize the JSON."""
-    
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    # Check if this is a relational JSON
-    is_relational = "documents" in data and "sections" in data and "content_blocks" in data
-    
-    # Try to load relational version if it exists
-    relational_data = None
-    relational_path = Path(json_path).parent / f"{Path(json_path).stem}_relational.json"
-    if not is_relational and relational_path.exists():
-        try:
-            with open(relational_path, "r", encoding="utf-8") as f:
-                relational_data = json.load(f)
-        except:
-            pass
-    
-    # Generate hierarchical view
-    hierarchical_html = json_to_html(data) if not is_relational else "<p>No hierarchical data available.</p>"
-    
-    # Generate relational view
-    if is_relational:
-        relational_html = relational_to_html_tables(data)
-    elif relational_data:
-        relational_html = relational_to_html_tables(relational_data)
-    else:
-        relational_html = "<p>No relational data available. Run the digitizer to generate the *_relational.json file.</p>"
-    
-    html_content = f"""
+# Page template around the two generated views; HTML_PREFIX is filled
+# with str.format_map(), so its literal braces are doubled
+HTML_PREFIX = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>JSON Visualization: {Path(json_path).name}</title>
+    <title>JSON Visualization: {name}</title>
     <style>
         body {{ font-family: sans-serif; background-color: #f4f4f9; padding: 20px; margin: 0; }}
         
@@ -217,7 +95,7 @@ def generate_html_preview(json_path: str, output_path: str):
 </head>
 <body>
     <h1>Document Visualization</h1>
-    <p>Source: {json_path}</p>
+    <p>Source: {source}</p>
     
     <div class="tabs">
         <div class="tab active" data-tab="hierarchical">Hierarchical View</div>
@@ -228,18 +106,207 @@ def generate_html_preview(json_path: str, output_path: str):
         <button onclick="expandAll()">Expand All</button>
         <button onclick="collapseAll()">Collapse All</button>
         <hr>
-        {hierarchical_html}
+        """
+
+HTML_MIDDLE = """
     </div>
     
     <div id="relational" class="tab-content">
-        {relational_html}
+        """
+
+HTML_SUFFIX = """
     </div>
 </body>
 </html>
     """
+
+def json_to_html(node, level=0, write=None):
+    """
+    Converts a JSON node (and its subtree) to HTML.
+
+    Fragments are passed to write (e.g. a file's write method) as they are
+    produced; when it is not given, the joined HTML string is returned.
+    The tree is walked with an explicit stack, so deep documents don't hit
+    the recursion limit.
+    """
+    parts = None
+    if write is None:
+        parts = []
+        write = parts.append
+    add = write
+
+    # Entries are (node, level) to render, or closing-tag strings to emit
+    # once all of a node's children have been rendered
+    stack = [(node, level)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        item = pop()
+        if isinstance(item, str):
+            add(item)
+            continue
+        node, level = item
+        _node_html(node, level, add)
+
+        indent = "  " * level
+        children = node.get("children", [])
+        if children:
+            add(f'{indent}  <div class="children">\n')
+            push(f'{indent}  </div>\n{indent}</div>\n')
+            stack.extend((child, level + 1) for child in reversed(children))
+        else:
+            add(f'{indent}</div>\n')
+    
+    if parts is not None:
+        return "".join(parts)
+
+def _node_html(node, level, add):
+    """Emits a node's opening tag, header and content (everything but its children)."""
+    node_type = node.get("type", "unknown")
+    node_type_html = escape(str(node_type))
+    text = node.get("text", "")
+    title = node.get("title", "")
+    src = node.get("src", "")
+    caption = node.get("caption", "")
+    
+    indent = "  " * level
+    add(f'{indent}<div class="node node-{node_type_html}">\n')
+    
+    # Header for the node
+    add(f'{indent}  <div class="node-header">\n')
+    add(f'{indent}    <span class="badge">{node_type_html}</span>\n')
+    
+    if title:
+        add(f'{indent}    <span class="title">{escape(title)}</span>\n')
+    # Long text gets a truncated preview here and the full text below
+    long_text = bool(text) and len(text) > 100
+    if text:
+        # Escaped after truncating, so entities are never cut in half
+        preview = text[:100] + "..." if long_text else text
+        add(f'{indent}    <span class="text-preview">{escape(preview)}</span>\n')
+        
+    add(f'{indent}  </div>\n')
+    
+    # Content details
+    add(f'{indent}  <div class="node-content">\n')
+    if long_text:
+        add(f'{indent}    <p class="full-text">{escape(text)}</p>\n')
+        
+    if src:
+        src = escape(src)
+        if node_type == "image":
+            add(f'{indent}    <img src="{src}" alt="Extracted Image" style="max-width: 300px;">\n')
+        elif node_type == "table":
+            add(f'{indent}    <p><a href="{src}" target="_blank">View Table CSV</a></p>\n')
+            
+    if caption:
+        add(f'{indent}    <p class="caption">Caption: {escape(caption)}</p>\n')
+        
+    add(f'{indent}  </div>\n')
+
+def _short_id(value) -> str:
+    """Formats an id as its escaped first 8 characters plus '...'."""
+    return escape(str(value or "")[:8]) + "..."
+
+def relational_to_html_tables(relational_data, write=None):
+    """
+    Converts relational JSON to HTML tables.
+
+    Fragments are passed to write as they are produced; when it is not
+    given, the joined HTML string is returned.
+    """
+    
+    parts = None
+    if write is None:
+        parts = []
+        write = parts.append
+    add = write
+    
+    # Documents Table
+    if "documents" in relational_data:
+        add('<h2>Documents</h2>\n')
+        add('<table class="relational-table">\n')
+        add('<thead><tr><th>ID</th><th>Title</th><th>Metadata</th></tr></thead>\n<tbody>\n')
+        for doc in relational_data["documents"]:
+            metadata_str = json.dumps(doc.get("metadata", {}), indent=2)
+            add(f'<tr><td>{_short_id(doc.get("id"))}</td><td>{escape(doc.get("title") or "")}</td><td><pre>{escape(metadata_str)}</pre></td></tr>\n')
+        add('</tbody></table>\n')
+    
+    # Sections Table
+    if "sections" in relational_data:
+        add('<h2>Sections</h2>\n')
+        add('<table class="relational-table">\n')
+        add('<thead><tr><th>ID</th><th>Document ID</th><th>Parent ID</th><th>Title</th><th>Order</th></tr></thead>\n<tbody>\n')
+        for section in relational_data["sections"][:50]:  # Limit to first 50
+            parent_id = section.get("parent_id")
+            parent_id = _short_id(parent_id) if parent_id else "None"
+            add(f'<tr><td>{_short_id(section.get("id"))}</td><td>{_short_id(section.get("document_id"))}</td><td>{parent_id}</td><td>{escape(section.get("title") or "")}</td><td>{escape(str(section.get("order", "")))}</td></tr>\n')
+        if len(relational_data["sections"]) > 50:
+            add(f'<tr><td colspan="5"><em>... and {len(relational_data["sections"]) - 50} more sections</em></td></tr>\n')
+        add('</tbody></table>\n')
+    
+    # Content Blocks Table
+    if "content_blocks" in relational_data:
+        add('<h2>Content Blocks</h2>\n')
+        add('<table class="relational-table">\n')
+        add('<thead><tr><th>ID</th><th>Section ID</th><th>Type</th><th>Text Preview</th><th>Order</th></tr></thead>\n<tbody>\n')
+        for block in relational_data["content_blocks"][:100]:  # Limit to first 100
+            text = block.get("text", "")
+            text_preview = text[:50] + "..." if text and len(text) > 50 else text or ""
+            section_id = block.get("section_id")
+            section_id = _short_id(section_id) if section_id else "None"
+            add(f'<tr><td>{_short_id(block.get("id"))}</td><td>{section_id}</td><td>{escape(str(block.get("type", "")))}</td><td>{escape(text_preview)}</td><td>{escape(str(block.get("order", "")))}</td></tr>\n')
+        if len(relational_data["content_blocks"]) > 100:
+            add(f'<tr><td colspan="5"><em>... and {len(relational_data["content_blocks"]) - 100} more content blocks</em></td></tr>\n')
+        add('</tbody></table>\n')
+    
+    if parts is not None:
+        return "".join(parts)
+
+def load_json(path) -> dict:
+    """Loads a JSON file (with orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def generate_html_preview(json_path: str, output_path: str):
+    """Generates a standalone HTML file to visualize the JSON."""
+    
+    data = load_json(json_path)
+    
+    # Check if this is a relational JSON
+    is_relational = "documents" in data and "sections" in data and "content_blocks" in data
+    
+    # Try to load relational version if it exists
+    relational_data = None
+    relational_path = Path(json_path).parent / f"{Path(json_path).stem}_relational.json"
+    if not is_relational and relational_path.exists():
+        try:
+            relational_data = load_json(relational_path)
+        except:
+            pass
     
     with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
+        write = f.write
+        write(HTML_PREFIX.format_map({"name": escape(Path(json_path).name), "source": escape(json_path)}))
+        
+        # Hierarchical view
+        if is_relational:
+            write("<p>No hierarchical data available.</p>")
+        else:
+            json_to_html(data, write=write)
+        
+        write(HTML_MIDDLE)
+        
+        # Relational view
+        if is_relational:
+            relational_to_html_tables(data, write)
+        elif relational_data:
+            relational_to_html_tables(relational_data, write)
+        else:
+            write("<p>No relational data available. Run the digitizer to generate the *_relational.json file.</p>")
+        
+        write(HTML_SUFFIX)
     
     print(f"HTML preview generated at: {output_path}")
 
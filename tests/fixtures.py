@@ -0,0 +1,97 @@
+"""
+Shared test documents.
+
+The structures are built once at import. transform_to_nodes() and
+DocumentRepository.create_from_json() only read their input, so tests pass
+them directly; copy.deepcopy() one first if a test needs to modify it.
+"""
+
+# Hierarchical JSON (transformer.py output) for the database tests
+SAMPLE_DOC_JSON = {
+    "id": "test-001",
+    "title": "Test Document",
+    "metadata": {"source": "test.pdf", "page_count": 1},
+    "page_headers": ["Header"],
+    "page_footers": ["Footer"],
+    "children": [
+        {
+            "type": "section",
+            "id": "sec-001",
+            "title": "Test Section",
+            "level": 1,
+            "children": [
+                {
+                    "type": "text",
+                    "id": "txt-001",
+                    "text": "This is a test paragraph."
+                }
+            ]
+        }
+    ]
+}
+
+# Document
+#   Section 1 (H1)
+#     Text 1
+#     Section 1.1 (H2)
+#       Text 1.1
+#   Section 2 (H1)
+#     Text 2
+HIERARCHY_ELEMENTS = [
+    {"label": "section_header", "text": "Section 1", "level": 1},
+    {"label": "text", "text": "Text 1"},
+    {"label": "section_header", "text": "Section 1.1", "level": 2},
+    {"label": "text", "text": "Text 1.1"},
+    {"label": "section_header", "text": "Section 2", "level": 1},
+    {"label": "text", "text": "Text 2"},
+]
+
+HEADER_FOOTER_ELEMENTS = [
+    {"label": "page_header", "text": "Header 1"},
+    {"label": "text", "text": "Content 1"},
+    {"label": "page_footer", "text": "Footer 1"},
+    {"label": "page_header", "text": "Header 1"},  # Duplicate
+    {"label": "text", "text": "Content 2"},
+    {"label": "page_footer", "text": "Footer 2"},
+]
+
+# Table 1 (Page 1), then Table 1 (Page 2) with the same columns
+TABLE_MERGE_ELEMENTS = [
+    {
+        "label": "table",
+        "data": {
+            "grid": [
+                [{"text": "Col1"}, {"text": "Col2"}],
+                [{"text": "Val1"}, {"text": "Val2"}]
+            ]
+        }
+    },
+    {"label": "page_footer", "text": "Footer 1"},
+    {"label": "page_header", "text": "Header 2"},
+    {
+        "label": "table",
+        "data": {
+            "grid": [
+                [{"text": "Col1"}, {"text": "Col2"}],  # Same columns
+                [{"text": "Val3"}, {"text": "Val4"}]
+            ]
+        }
+    },
+]
+
+
+def docling_dict(elements):
+    """
+    Wrap elements in a Docling-style export_to_dict() result.
+
+    body.children holds "#/body/elements/N" refs to the elements, which are
+    shared, not copied.
+    """
+    return {
+        "name": "Test Doc",
+        "origin": {"filename": "test.pdf"},
+        "body": {
+            "children": [{"$ref": f"#/body/elements/{i}"} for i in range(len(elements))],
+            "elements": elements
+        }
+    }
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from src.ai.cache import ResponseCache
+from src.ai.gemini_client import GeminiClient
+
+MESSAGES = [SystemMessage(content="Summarize."), HumanMessage(content="a,b\n1,2")]
+
+class FakeLLM:
+    __slots__ = ("model",)
+
+    def __init__(self, model):
+        self.model = model
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "cache.sqlite")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_hit_and_miss(self):
+        cache = ResponseCache()
+        key = ResponseCache.make_key("model", MESSAGES)
+        self.assertIsNone(cache.get(key))
+        cache.put(key, "summary")
+        self.assertEqual(cache.get(key), "summary")
+        self.assertIsNone(cache.get(ResponseCache.make_key("model", MESSAGES[:1])))
+
+    def test_persistent_hit(self):
+        key = ResponseCache.make_key("model", MESSAGES)
+        ResponseCache(self.path).put(key, "summary")
+        # A new instance has an empty memory layer and reads the SQLite file
+        self.assertEqual(ResponseCache(self.path).get(key), "summary")
+
+    def test_memory_eviction(self):
+        cache = ResponseCache(max_memory_items=2)
+        for key in ("a", "b", "c"):
+            cache.put(key, key)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), "c")
+
+    def test_key_includes_model_and_schema(self):
+        keys = {
+            ResponseCache.make_key("model-a", MESSAGES),
+            ResponseCache.make_key("model-b", MESSAGES),
+            ResponseCache.make_key("model-a", MESSAGES, "summary"),
+            ResponseCache.make_key("model-a", MESSAGES, "image_batch"),
+        }
+        self.assertEqual(len(keys), 4)
+        self.assertEqual(
+            ResponseCache.make_key("model-a", MESSAGES, "summary"),
+            ResponseCache.make_key("model-a", list(MESSAGES), "summary")
+        )
+
+    def test_client_keys_plain_and_json_models_apart(self):
+        # summarize_document_stream (plain model) and summarize_document
+        # (JSON model) share a model name and messages
+        with mock.patch.dict(os.environ, {"GEMINI_CACHE_PATH": ""}):
+            client = GeminiClient(api_key=None)
+        client.llm = FakeLLM("gemini")
+        client.summary_llm = FakeLLM("gemini")
+        client.image_batch_llm = FakeLLM("gemini")
+        keys = {client._cache_key(llm, MESSAGES)
+                for llm in (client.llm, client.summary_llm, client.image_batch_llm)}
+        self.assertEqual(len(keys), 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""Database smoke test - SQLAlchemy 2.0 compatible.
+
+All steps share one session and connection through the module-scoped
+``db`` fixture and run inside a single transaction that is rolled back at
+the end; they run in file order and build on each other: create, retrieve,
+search, delete, then idempotent re-ingest.
+"""
+
+import copy
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from src.database import get_engine, init_db
+from src.database.models import Base, ContentBlock, Document, Section
+from src.database.repository import DocumentRepository
+from fixtures import SAMPLE_DOC_JSON
+
+@pytest.fixture(scope="module")
+def db():
+    # One outer transaction for the whole module, rolled back at the end so
+    # nothing is left behind; the repositories' commits only release
+    # savepoints inside it
+    init_db()
+    connection = get_engine().connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(autouse=True)
+def _reset_failed_step(db):
+    # Roll back to the last savepoint if a step failed, so later steps still run
+    yield
+    db.rollback()
+
+
+def test_sqlite_version():
+    assert sqlite3.sqlite_version
+
+
+def test_create_document(db):
+    doc = DocumentRepository(db).create_from_json(SAMPLE_DOC_JSON)
+    assert doc.title == "Test Document"
+    assert doc.id == "test-001"
+    assert len(doc.sections) == 1
+
+
+def test_get_by_id(db):
+    doc = DocumentRepository(db).get_by_id("test-001")
+    assert doc is not None
+    assert doc.title == "Test Document"
+    assert doc.created_at is not None
+
+
+def test_search(db):
+    repo = DocumentRepository(db)
+    results = list(repo.search("Test"))
+    assert any(doc.id == "test-001" for doc in results)
+    # Too short for the SQLite trigram index; matched with LIKE instead
+    assert any(doc.id == "test-001" for doc in repo.search("es"))
+    assert repo.count() >= 1
+
+
+def test_delete(db):
+    repo = DocumentRepository(db)
+    assert repo.delete("test-001")
+    assert repo.get_by_id("test-001") is None
+
+
+def _row_counts(db):
+    return tuple(
+        db.execute(select(func.count()).select_from(model)).scalar_one()
+        for model in (Document, Section, ContentBlock)
+    )
+
+
+def test_reingest_is_idempotent(db):
+    repo = DocumentRepository(db)
+    repo.create_from_json(SAMPLE_DOC_JSON)
+    counts = _row_counts(db)
+    doc = repo.create_from_json(SAMPLE_DOC_JSON)
+    assert doc.id == SAMPLE_DOC_JSON["id"]
+    assert _row_counts(db) == counts
+
+
+def test_create_many_from_json(db):
+    repo = DocumentRepository(db)
+    other = copy.deepcopy(SAMPLE_DOC_JSON)
+    other["id"] = "test-002"
+    # The second document reuses the first one's child ids; those rows are skipped
+    before = _row_counts(db)
+    docs = repo.create_many_from_json([SAMPLE_DOC_JSON, other, other])
+    assert [doc.id for doc in docs] == [SAMPLE_DOC_JSON["id"], "test-002", "test-002"]
+    after = _row_counts(db)
+    assert after[0] == before[0] + 1
+    assert after[1:] == before[1:]
+    # Ingesting the same batch again changes nothing
+    repo.create_many_from_json([SAMPLE_DOC_JSON, other])
+    assert _row_counts(db) == after
+
+
+def test_search_after_vacuum(tmp_path):
+    # VACUUM may renumber the implicit rowids of documents; search must
+    # still find the right document afterwards
+    engine = create_engine(f"sqlite:///{tmp_path / 'vacuum.db'}")
+    try:
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            repo = DocumentRepository(session)
+            for i in range(20):
+                repo.create_from_json({"id": f"doc-{i:02d}", "title": f"Report {i:02d}"})
+            for i in range(0, 20, 2):
+                repo.delete(f"doc-{i:02d}")
+        with engine.connect() as connection:
+            connection.exec_driver_sql("VACUUM")
+            # Current SQLite versions usually keep rowids here; renumber them
+            # explicitly as VACUUM is allowed to
+            connection.exec_driver_sql("UPDATE documents SET rowid = rowid + 1000")
+            connection.commit()
+        with Session(engine) as session:
+            results = [doc.id for doc in DocumentRepository(session).search("Report 07")]
+        assert results == ["doc-07"]
+    finally:
+        engine.dispose()
@@ -0,0 +1,58 @@
+import json
+import os
+import queue
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+# digitizer.py imports its sibling modules as top-level scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import digitizer
+from fixtures import HIERARCHY_ELEMENTS, docling_dict
+
+class MockDoclingDoc:
+    __slots__ = ("data", "pictures")
+
+    def __init__(self, data):
+        self.data = data
+        self.pictures = []
+
+    def export_to_dict(self):
+        return self.data
+
+# Stand-in for docling's ConversionStatus (docling is an optional import)
+STATUS = SimpleNamespace(SUCCESS="success", PARTIAL_SUCCESS="partial_success")
+
+class TestConsumeResults(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_queued_result_is_saved(self):
+        result = SimpleNamespace(
+            status=STATUS.SUCCESS,
+            errors=[],
+            input=SimpleNamespace(file=Path("report.pdf")),
+            document=MockDoclingDoc(docling_dict(HIERARCHY_ELEMENTS))
+        )
+        pending = queue.Queue()
+        pending.put((result, Path(result.input.file), 0.0))
+        pending.put(None)
+
+        with mock.patch.object(digitizer, "ConversionStatus", STATUS):
+            digitizer._consume_results(pending, self.output_dir)
+
+        json_path = self.output_dir / "report" / "report.json"
+        with open(json_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["title"], "Test Doc")
+        self.assertTrue((self.output_dir / "report" / "report_relational.json").exists())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import errno
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import schema_converter
+from src.schema_converter import write_json
+
+class TestWriteJson(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self._tmp.name, "out.json")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_direct_write_failure_falls_back(self):
+        # Large enough for the O_DIRECT path
+        data = {"text": "x" * schema_converter.DIRECT_IO_MIN_BYTES}
+        real_open = os.open
+
+        def open_without_direct(path, flags, mode=0o777):
+            # Let the open succeed on filesystems without O_DIRECT support
+            return real_open(path, flags & ~getattr(os, "O_DIRECT", 0), mode)
+
+        def failing_write(fd, data):
+            raise OSError(errno.EINVAL, "Invalid argument")
+
+        with mock.patch.object(schema_converter, "DIRECT_IO", True), \
+                mock.patch.object(schema_converter.os, "O_DIRECT", 0o40000, create=True), \
+                mock.patch.object(schema_converter.os, "open", open_without_direct), \
+                mock.patch.object(schema_converter.os, "write", failing_write):
+            write_json(data, self.output_path)
+
+        with open(self.output_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), data)
+        self.assertFalse(os.path.exists(self.output_path + ".tmp"))
+
+if __name__ == "__main__":
+    unittest.main()
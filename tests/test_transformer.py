@@ -1,10 +1,17 @@
+import contextlib
+import io
 import unittest
 import json
 import os
-import shutil
+import tempfile
 from src.transformer import transform_to_nodes
+from fixtures import (
+    HEADER_FOOTER_ELEMENTS, HIERARCHY_ELEMENTS, TABLE_MERGE_ELEMENTS, docling_dict
+)
 
 class MockDoclingDoc:
+    __slots__ = ("data", "pictures")
+
     def __init__(self, data):
         self.data = data
         self.pictures = []
@@ -13,68 +20,22 @@ class MockDoclingDoc:
         return self.data
 
 class TestTransformer(unittest.TestCase):
-    def setUp(self):
-        self.images_dir = "test_output/images"
-        self.tables_dir = "test_output/tables"
-        os.makedirs(self.images_dir, exist_ok=True)
-        os.makedirs(self.tables_dir, exist_ok=True)
+    @classmethod
+    def setUpClass(cls):
+        # One output directory for all tests; asset files are named by
+        # node UUID, so tests cannot overwrite each other's files
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.images_dir = os.path.join(cls._tmp.name, "images")
+        cls.tables_dir = os.path.join(cls._tmp.name, "tables")
+        os.makedirs(cls.images_dir)
+        os.makedirs(cls.tables_dir)
 
-    def tearDown(self):
-        if os.path.exists("test_output"):
-            shutil.rmtree("test_output")
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
 
     def test_hierarchy(self):
-        # Create a mock document structure
-        # Document
-        #   Section 1 (H1)
-        #     Text 1
-        #     Section 1.1 (H2)
-        #       Text 1.1
-        #   Section 2 (H1)
-        #     Text 2
-        
-        data = {
-            "name": "Test Doc",
-            "origin": {"filename": "test.pdf"},
-            "body": {
-                "children": [
-                    {"$ref": "#/body/children/0"},
-                    {"$ref": "#/body/children/1"},
-                    {"$ref": "#/body/children/2"},
-                    {"$ref": "#/body/children/3"},
-                    {"$ref": "#/body/children/4"},
-                    {"$ref": "#/body/children/5"},
-                ]
-            }
-        }
-        
-        # We need to populate the data structure so resolve_ref works
-        # This is a bit hacky but mimics the structure
-        # We'll just put the elements in a list and map them
-        
-        elements = [
-            {"label": "section_header", "text": "Section 1", "level": 1},
-            {"label": "text", "text": "Text 1"},
-            {"label": "section_header", "text": "Section 1.1", "level": 2},
-            {"label": "text", "text": "Text 1.1"},
-            {"label": "section_header", "text": "Section 2", "level": 1},
-            {"label": "text", "text": "Text 2"},
-        ]
-        
-        data["body"]["children"] = elements
-
-        # Mock the resolve_ref logic by making the data structure match what the transformer expects
-        # The transformer expects refs like #/body/children/0
-        # And it resolves them by traversing the dict.
-        # So we need to make sure data["body"]["children"][0] is the element.
-        # Wait, the transformer iterates over body.children, which is a list of refs.
-        # So I need to structure it correctly.
-        
-        refs = [{"$ref": f"#/body/elements/{i}"} for i in range(len(elements))]
-        data["body"]["children"] = refs
-        data["body"]["elements"] = elements
-
-        doc = MockDoclingDoc(data)
+        doc = MockDoclingDoc(docling_dict(HIERARCHY_ELEMENTS))
         
         result = transform_to_nodes(doc, self.images_dir, self.tables_dir)
         
@@ -98,33 +59,14 @@ class TestTransformer(unittest.TestCase):
         self.assertEqual(len(sec2["children"]), 1) # Text 2
 
     def test_headers_footers(self):
-        # Mock data with headers and footers
-        elements = [
-            {"label": "page_header", "text": "Header 1"},
-            {"label": "text", "text": "Content 1"},
-            {"label": "page_footer", "text": "Footer 1"},
-            {"label": "page_header", "text": "Header 1"}, # Duplicate
-            {"label": "text", "text": "Content 2"},
-            {"label": "page_footer", "text": "Footer 2"},
-        ]
-        
-        data = {
-            "name": "Test Doc",
-            "origin": {"filename": "test.pdf"},
-            "body": {
-                "children": [{"$ref": f"#/body/elements/{i}"} for i in range(len(elements))],
-                "elements": elements
-            }
-        }
-        
-        doc = MockDoclingDoc(data)
+        doc = MockDoclingDoc(docling_dict(HEADER_FOOTER_ELEMENTS))
         result = transform_to_nodes(doc, self.images_dir, self.tables_dir)
         
         # Verify headers/footers in root
         self.assertIn("page_headers", result)
         self.assertIn("page_footers", result)
-        self.assertEqual(set(result["page_headers"]), {"Header 1"})
-        self.assertEqual(set(result["page_footers"]), {"Footer 1", "Footer 2"})
+        self.assertEqual(result["page_headers"], ("Header 1",))
+        self.assertEqual(result["page_footers"], ("Footer 1", "Footer 2"))
         
         # Verify they are NOT in children
         self.assertEqual(len(result["children"]), 2) # Content 1, Content 2
@@ -133,47 +75,8 @@ class TestTransformer(unittest.TestCase):
             self.assertNotEqual(child["type"], "page_footer")
 
     def test_table_merge(self):
-        # Mock data with split tables
-        # Table 1 (Page 1)
-        # Table 1 (Page 2) - same columns
-        
-        elements = [
-            {
-                "label": "table", 
-                "data": {
-                    "grid": [
-                        [{"text": "Col1"}, {"text": "Col2"}],
-                        [{"text": "Val1"}, {"text": "Val2"}]
-                    ]
-                }
-            },
-            {
-                "label": "page_footer", "text": "Footer 1"
-            },
-            {
-                "label": "page_header", "text": "Header 2"
-            },
-            {
-                "label": "table", 
-                "data": {
-                    "grid": [
-                        [{"text": "Col1"}, {"text": "Col2"}], # Same columns
-                        [{"text": "Val3"}, {"text": "Val4"}]
-                    ]
-                }
-            }
-        ]
-        
-        data = {
-            "name": "Test Doc",
-            "origin": {"filename": "test.pdf"},
-            "body": {
-                "children": [{"$ref": f"#/body/elements/{i}"} for i in range(len(elements))],
-                "elements": elements
-            }
-        }
-        
-        doc = MockDoclingDoc(data)
+        # Split table: same columns on both pages
+        doc = MockDoclingDoc(docling_dict(TABLE_MERGE_ELEMENTS))
         result = transform_to_nodes(doc, self.images_dir, self.tables_dir)
         
         # Verify merging
@@ -197,5 +100,62 @@ class TestTransformer(unittest.TestCase):
         self.assertEqual(merged_table["rows"][0], ["Val1", "Val2"])
         self.assertEqual(merged_table["rows"][1], ["Val3", "Val4"])
 
+    def test_self_ref_resolution(self):
+        # Docling-style document: body children reference items in the
+        # top-level texts/tables lists by their self_ref
+        data = {
+            "name": "Test Doc",
+            "origin": {"filename": "test.pdf"},
+            "body": {
+                "children": [{"$ref": "#/texts/0"}, {"$ref": "#/tables/0"}]
+            },
+            "texts": [
+                {"self_ref": "#/texts/0", "label": "text", "text": "Intro"},
+                {"self_ref": "#/texts/1", "label": "caption", "text": "Table 1"},
+            ],
+            "tables": [
+                {
+                    "self_ref": "#/tables/0",
+                    "label": "table",
+                    "captions": [{"$ref": "#/texts/1"}],
+                    "data": {"grid": [[{"text": "A"}], [{"text": "1"}]]}
+                }
+            ]
+        }
+        
+        doc = MockDoclingDoc(data)
+        result = transform_to_nodes(doc, self.images_dir, self.tables_dir)
+        
+        self.assertEqual(len(result["children"]), 2)
+        self.assertEqual(result["children"][0]["text"], "Intro")
+        table = result["children"][1]
+        self.assertEqual(table["caption"], "Table 1")
+        self.assertEqual(table["columns"], ["A"])
+
+    def test_image_save_error(self):
+        class FailingPicture:
+            self_ref = "#/pictures/0"
+
+            def get_image(self, doc):
+                raise OSError("cannot render")
+
+        data = {
+            "name": "Test Doc",
+            "origin": {"filename": "test.pdf"},
+            "body": {"children": [{"$ref": "#/pictures/0"}]},
+            "pictures": [{"self_ref": "#/pictures/0", "label": "picture"}]
+        }
+        doc = MockDoclingDoc(data)
+        doc.pictures = [FailingPicture()]
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            result = transform_to_nodes(doc, self.images_dir, self.tables_dir)
+
+        image = result["children"][0]
+        self.assertNotIn("src", image)
+        self.assertIn("ERROR: Could not process image", output.getvalue())
+        self.assertNotIn("no matching picture found", output.getvalue())
+
 if __name__ == "__main__":
     unittest.main()
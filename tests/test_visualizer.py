@@ -0,0 +1,44 @@
+import unittest
+from src.visualizer import json_to_html, relational_to_html_tables
+
+UNSAFE = "<script>&"
+ESCAPED = "&lt;script&gt;&amp;"
+
+class TestVisualizer(unittest.TestCase):
+    def test_node_fields_escaped(self):
+        node = {
+            "type": UNSAFE,
+            "title": UNSAFE,
+            "text": UNSAFE,
+            "caption": UNSAFE,
+            "children": [{"type": "image", "src": UNSAFE}]
+        }
+
+        html = json_to_html(node)
+
+        self.assertNotIn("<script>", html)
+        self.assertIn(f'class="node node-{ESCAPED}"', html)
+        self.assertIn(f'<span class="badge">{ESCAPED}</span>', html)
+        self.assertIn(f'<span class="title">{ESCAPED}</span>', html)
+        self.assertIn(f'<img src="{ESCAPED}"', html)
+
+    def test_relational_fields_escaped(self):
+        data = {
+            "documents": [{"id": UNSAFE, "title": UNSAFE, "metadata": {"source": UNSAFE}}],
+            "sections": [
+                {"id": UNSAFE, "document_id": UNSAFE, "parent_id": UNSAFE, "title": UNSAFE, "order": UNSAFE}
+            ],
+            "content_blocks": [
+                {"id": UNSAFE, "section_id": UNSAFE, "type": UNSAFE, "text": UNSAFE, "order": UNSAFE}
+            ]
+        }
+
+        html = relational_to_html_tables(data)
+
+        self.assertNotIn("<script>", html)
+        # Ids are cut to 8 characters before escaping
+        self.assertIn("<td>&lt;script&gt;...</td>", html)
+        self.assertIn(f"<td>{ESCAPED}</td>", html)
+
+if __name__ == "__main__":
+    unittest.main()